@@ -0,0 +1,144 @@
+import reduction as rd
+from itertools import chain
+
+
+def update_pairs(G, P, h, active = None):
+    """
+    Prune S-pairs when a new polynomial h joins the basis G, following the Gebauer-Möller installation of
+    Buchberger's coprime criterion and chain criterion.
+    @param G: The current basis, not including h.
+    @param P: The current pairs, as an iterable of pairs (i, j) of positions in G with i < j.
+    @param h: The new basis element, to be appended to G at position len(G).
+    @param active: Optional set of positions of the elements of G still in use, new pairs are only formed with them.
+    @return: The list of new pairs with h to add (in the order of G), the list of current pairs to remove (in the order of P),
+    and the number of pairs pruned.
+    """
+
+    packer = h.packer
+    lt_h = h.lm
+    position = len(G)
+    num_pruned = 0
+
+    # Chain criterion among the new pairs: keep (g, h) only if no other new pair has an lcm dividing its lcm.
+    # Pairs with coprime leading terms are kept at this stage so that they can still eliminate others.
+    positions = range(len(G)) if active is None else sorted(active)
+    C = [(i, packer.lcm(G[i].lm, lt_h)) for i in positions]
+    D = []
+    for k, (i, lcm_1) in enumerate(C):
+        if packer.is_coprime(G[i].lm, lt_h) or \
+                not any(packer.divides(lcm_2, lcm_1) for _, lcm_2 in chain(C[k + 1:], D)):
+            D.append((i, lcm_1))
+        else:
+            num_pruned += 1
+
+    # Coprime criterion: the S-polynomial of two polynomials with coprime leading terms reduces to zero
+    new_pairs = []
+    for i, _ in D:
+        if packer.is_coprime(G[i].lm, lt_h):
+            num_pruned += 1
+        else:
+            new_pairs.append((i, position))
+
+    # Chain criterion on the current pairs: (f, g) is redundant if lt(h) divides lcm(f, g) and both (f, h) and (g, h)
+    # have a strictly smaller lcm
+    removed = []
+    for i, j in P:
+        lt_f, lt_g = G[i].lm, G[j].lm
+        lcm_fg = packer.lcm(lt_f, lt_g)
+        if packer.divides(lt_h, lcm_fg) and packer.lcm(lt_f, lt_h) != lcm_fg and packer.lcm(lt_g, lt_h) != lcm_fg:
+            removed.append((i, j))
+    num_pruned += len(removed)
+
+    return new_pairs, removed, num_pruned
+
+
+def initial_pairs(G, criteria):
+    """
+    Build the initial list of S-pairs of a basis.
+    @param G: The list of input polynomials.
+    @param criteria: Whether to prune pairs with the coprime and chain criteria.
+    @return: The list of pairs (i, j) of positions in G with i < j, and the number of pairs pruned.
+    """
+
+    if not criteria:
+        return [(i, j) for i in range(len(G)) for j in range(i + 1, len(G))], 0
+
+    P = []
+    num_pruned = 0
+    for i in range(len(G)):
+        new_pairs, removed, new_pruned = update_pairs(G[:i], P, G[i])
+        removed = set(removed)
+        P = [x for x in P if x not in removed] + new_pairs
+        num_pruned += new_pruned
+    return P, num_pruned
+
+
+def add_to_basis(G, P, r, index, criteria, active = None):
+    """
+    Append a new polynomial to the basis and queue its S-pairs.
+    @param G: The basis, modified in place.
+    @param P: The pair queue, modified in place.
+    @param r: The new nonzero polynomial, reduced with respect to G.
+    @param index: The divisor index of the reducers, modified in place.
+    @param criteria: Whether to prune pairs with the coprime and chain criteria.
+    @param active: Optional set of positions of the elements of G still in use, modified in place. Elements whose leading term
+    is divisible by the leading term of r are dropped from it and from the index: they are redundant for reduction,
+    and form no further pairs.
+    @return: The number of pairs pruned.
+    """
+
+    num_pruned = 0
+    if criteria:
+        new_pairs, removed, num_pruned = update_pairs(G, P, r, active)
+        for ij in removed:
+            P.remove(ij)
+    else:
+        positions = range(len(G)) if active is None else sorted(active)
+        new_pairs = [(i, len(G)) for i in positions]
+
+    if active is not None:
+        packer = r.packer
+        for i in sorted(active):
+            # The masks reject most non-divisors before unpacking anything
+            if r.divmask & ~G[i].divmask == 0 and packer.divides(r.lm, G[i].lm):
+                active.remove(i)
+                index.remove(G[i])
+        active.add(len(G))
+    G.append(r)
+    index.add(r)
+    P.extend(new_pairs)
+
+    return num_pruned
+
+
+def reduced_basis(G):
+    """
+    Compute the reduced Gröbner basis from a Gröbner basis: drop the elements whose leading term is divisible by the leading term
+    of another element, make the remaining ones monic and reduce every term of each of them by the others.
+    @param G: A Gröbner basis represented as a list of polynomials.
+    @return: The unique reduced Gröbner basis, sorted by increasing leading term.
+    """
+
+    G = [g for g in G if not g.is_zero()]
+    minimal = []
+    for i, g in enumerate(G):
+        packer = g.packer
+        if not any([packer.divides(h.keys[0], g.keys[0]) and (h.keys[0] != g.keys[0] or j < i) for j, h in enumerate(G) if j != i]):
+            minimal.append(g)
+
+    monic = [g.scalar_multiply(g.field.inv(g.lc)) for g in minimal]
+    reduced = [rd.reduce_full(g, monic[:i] + monic[i + 1:])[0] for i, g in enumerate(monic)]
+
+    return sorted(reduced, key = lambda g: g.keys[0])
+
+
+def remove_duplicate(lst):
+    """
+    Remove duplicates in a list and preserve order.
+    @param lst: The list from which to remove duplicates.
+    @return: A list with duplicates removed and order preserved.
+    """
+
+    seen = set()
+    seen_add = seen.add
+    return [x for x in lst if not (x in seen or seen_add(x))]
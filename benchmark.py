@@ -0,0 +1,387 @@
+import buchberger as buch
+import f4
+import signature as sg
+import parallel as pl
+import numpy as np
+import itertools
+import os
+import random
+import time
+import tracemalloc
+
+
+# The strategies available to the benchmarks
+STRATEGIES = {'random': buch.buchberger_random, 'first': buch.buchberger_first, 'degree': buch.buchberger_degree,
+              'f4': f4.buchberger_f4, 'signature': sg.buchberger_signature}
+
+# The strategies of buchberger_benchmark, in the order of its result lists
+CLASSIC = ('random', 'first', 'degree')
+
+# The columns recorded by the benchmark suite for every (ideal, strategy) job
+COLUMNS = ['n', 'd', 's', 'mode', 'ideal', 'strategy', 'num_add', 'num_pairs', 'num_zero', 'num_pruned', 'basis_size',
+           'wall_time', 'peak_memory', 'status']
+
+
+def job_seed(seed, *labels):
+    """
+    Derive the seed of one job from the seed of the whole run, independently of when and where the job runs.
+    @param seed: The seed of the run.
+    @param labels: Values identifying the job, such as the ideal number and the strategy.
+    @return: The seed of the job as an integer.
+    """
+
+    return random.Random('-'.join([str(x) for x in (seed, ) + labels])).getrandbits(64)
+
+
+def iter_ideals(n, d, s, mode, seed = 0, N = None):
+    """
+    Generate a stream of random ideals lazily, each from its own seed, so the stream takes constant memory and
+    ideal i is the same as in the benchmark jobs of the same seed.
+    @param n: The number of variables.
+    @param d: The maximal degree of a generator.
+    @param s: The number of generators.
+    @param mode: Generate ideals using "uniform" or "weighted" sampling.
+    @param seed: The seed of the stream.
+    @param N: The number of ideals, None for an endless stream.
+    @return: Iterator over tuples (i, ideal).
+    """
+
+    for i in (itertools.count() if N is None else range(N)):
+        random.seed(job_seed(seed, i))
+        yield i, buch.random_ideal(n, d, s, mode)
+
+
+def iter_jobs(n, d, s, N, mode, seed = 0, strategies = CLASSIC):
+    """
+    Generate the benchmark jobs lazily, every ideal with every strategy.
+    @param n: The number of variables.
+    @param d: The maximal degree of a generator.
+    @param s: The number of generators.
+    @param N: The number of polynomial ideals, None for an endless stream.
+    @param mode: Generate ideals using "uniform" or "weighted" sampling.
+    @param seed: The seed of the run.
+    @param strategies: The names of the strategies to run, keys of STRATEGIES.
+    @return: Iterator over jobs (i, strategy, n, d, s, mode, seed), ordered by ideal then strategy.
+    """
+
+    for i in (itertools.count() if N is None else range(N)):
+        for strategy in strategies:
+            yield i, strategy, n, d, s, mode, seed
+
+
+def run_job(job):
+    """
+    Generate one ideal from its seed and compute its Gröbner basis with one strategy.
+    Every strategy of the same ideal regenerates the same generators, so jobs can run in any process.
+    @param job: Tuple (i, strategy, n, d, s, mode, seed) where i is the number of the ideal.
+    @return: Tuple (i, strategy, num_add).
+    """
+
+    i, strategy, n, d, s, mode, seed = job
+    random.seed(job_seed(seed, i))
+    ideal = buch.random_ideal(n, d, s, mode)
+    random.seed(job_seed(seed, i, strategy))
+    num_add = STRATEGIES[strategy](ideal)[1]
+    return i, strategy, num_add
+
+
+def iter_benchmark(n, d, s, N, mode, processes = None, seed = 0, strategies = CLASSIC, chunksize = 1):
+    """
+    Run the benchmark jobs (every ideal with every strategy) on a process pool and yield their results in order as they complete.
+    @param n: The number of variables.
+    @param d: The maximal degree of a generator.
+    @param s: The number of generators.
+    @param N: The number of polynomial ideals, None for an endless stream.
+    @param mode: Generate ideals using "uniform" or "weighted" sampling.
+    @param processes: The number of worker processes, all cores by default. With 1, jobs run in the calling process.
+    @param seed: The seed of the run. Results depend only on the seed, not on the number of processes.
+    @param strategies: The names of the strategies to run, keys of STRATEGIES.
+    @param chunksize: The number of jobs sent to a worker at a time.
+    @return: Iterator over tuples (i, strategy, num_add), ordered by ideal then strategy.
+    """
+
+    assert all([isinstance(x, int) for x in [n, d, s]]) and (N is None or isinstance(N, int)), 'n, d, s, N should all be integers.'
+    assert all([x in STRATEGIES for x in strategies]), 'Unknown strategy.'
+
+    return pl.imap_jobs(run_job, iter_jobs(n, d, s, N, mode, seed, strategies), processes, chunksize)
+
+
+def parallel_benchmark(n, d, s, N, mode, processes = None, seed = 0, progress = None, chunksize = 1):
+    """
+    Compute the complexity (number of additions) for the three Buchberger algorithm variants using N binomial ideals,
+    like buchberger.buchberger_benchmark, spreading the (ideal, strategy) jobs over a process pool.
+    @param n: The number of variables.
+    @param d: The maximal degree of a generator.
+    @param s: The number of generators.
+    @param N: The number of polynomial ideals.
+    @param mode: Generate ideals using "uniform" or "weighted" sampling.
+    @param processes: The number of worker processes, all cores by default.
+    @param seed: The seed of the run.
+    @param progress: Optional function called as progress(done, total) after each completed job.
+    @param chunksize: The number of jobs sent to a worker at a time.
+    @return: The lists of numbers of additions for random, first and degree selection.
+    """
+
+    results = dict([(strategy, []) for strategy in CLASSIC])
+    total = N * len(CLASSIC)
+    for done, (_, strategy, num_add) in enumerate(iter_benchmark(n, d, s, N, mode, processes, seed, CLASSIC, chunksize)):
+        results[strategy].append(num_add)
+        if progress is not None:
+            progress(done + 1, total)
+
+    return results['random'], results['first'], results['degree']
+
+
+class RunningStats:
+    """
+    Summary statistics of a stream of numbers, updated one value at a time in constant memory with Welford's algorithm.
+    """
+
+    def __init__(self):
+        """
+        The constructor.
+        """
+
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+
+    def __repr__(self):
+        """
+        @return: The statistics printed in string.
+        """
+
+        return 'RunningStats(count={}, mean={:.4g}, std={:.4g}, min={}, max={})'.format(self.count, self.mean, self.std(), self.min, self.max)
+
+
+    def add(self, x):
+        """
+        Add a value.
+        @param x: The value.
+        """
+
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+
+
+    def merge(self, other):
+        """
+        Add the values summarized by other statistics.
+        @param other: Another RunningStats object.
+        """
+
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+
+    def variance(self):
+        """
+        @return: The sample variance, 0 with fewer than 2 values.
+        """
+
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+    def std(self):
+        """
+        @return: The sample standard deviation.
+        """
+
+        return self.variance() ** 0.5
+
+
+def stream_benchmark(n, d, s, N, mode, processes = None, seed = 0, strategies = CLASSIC, chunksize = 1, progress = None):
+    """
+    Run the benchmark as a lazy pipeline: ideals are generated from the seeded stream, solved, and reduced to summary statistics
+    of the numbers of additions on the fly, so memory use does not grow with N.
+    @param n: The number of variables.
+    @param d: The maximal degree of a generator.
+    @param s: The number of generators.
+    @param N: The number of polynomial ideals.
+    @param mode: Generate ideals using "uniform" or "weighted" sampling.
+    @param processes: The number of worker processes, all cores by default. With 1, jobs run in the calling process.
+    @param seed: The seed of the run. Results are those of iter_benchmark with the same seed.
+    @param strategies: The names of the strategies to run, keys of STRATEGIES.
+    @param chunksize: The number of jobs sent to a worker at a time.
+    @param progress: Optional function called as progress(done, stats) after each completed ideal, with the statistics so far.
+    @return: Dictionary mapping each strategy to the RunningStats of its numbers of additions.
+    """
+
+    stats = dict([(strategy, RunningStats()) for strategy in strategies])
+    for i, strategy, num_add in iter_benchmark(n, d, s, N, mode, processes, seed, strategies, chunksize):
+        stats[strategy].add(num_add)
+        if progress is not None and strategy == strategies[-1]:
+            progress(i + 1, stats)
+    return stats
+
+
+def measure_job(job):
+    """
+    Generate one ideal from its seed, compute its Gröbner basis with one strategy and measure the run.
+    The run is timed without tracing memory, whose overhead depends on the strategy, and then repeated from the same seed under
+    tracemalloc to measure its peak memory. A run stopped by its time limit is repeated up to the same number of pairs.
+    @param job: Tuple (i, strategy, n, d, s, mode, seed) where i is the number of the ideal, optionally followed by a dictionary of
+    bounds passed to the strategy, such as max_add and time_limit for the strategies of CLASSIC.
+    @return: Dictionary with a value for each of COLUMNS. Wall time is in seconds, peak memory in bytes allocated during the run.
+    The status is 'complete' unless a bound stopped the run.
+    """
+
+    i, strategy, n, d, s, mode, seed = job[:7]
+    limits = job[7] if len(job) > 7 else {}
+    random.seed(job_seed(seed, i))
+    ideal = buch.random_ideal(n, d, s, mode)
+
+    random.seed(job_seed(seed, i, strategy))
+    stats = {}
+    start = time.perf_counter()
+    G, num_add = STRATEGIES[strategy](ideal, stats = stats, **limits)
+    wall_time = time.perf_counter() - start
+
+    memory_limits = dict([(key, value) for key, value in limits.items() if key != 'time_limit'])
+    if stats.get('status') == 'time_limit':
+        memory_limits['max_pairs'] = stats['num_pairs']
+    random.seed(job_seed(seed, i, strategy))
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    STRATEGIES[strategy](ideal, stats = {}, **memory_limits)
+    peak_memory = tracemalloc.get_traced_memory()[1] - start_memory
+    if not tracing:
+        tracemalloc.stop()
+
+    return {'n': n, 'd': d, 's': s, 'mode': mode, 'ideal': i, 'strategy': strategy, 'num_add': num_add,
+            'num_pairs': stats['num_pairs'], 'num_zero': stats['num_zero'], 'num_pruned': stats['num_pruned'],
+            'basis_size': len(G), 'wall_time': wall_time, 'peak_memory': peak_memory, 'status': stats.get('status', 'complete')}
+
+
+def chunk_path(path, n, d, s, mode, start = 0):
+    """
+    Get the file of a batch of results of one point of a benchmark sweep.
+    @param path: The directory of the sweep.
+    @param n: The number of variables.
+    @param d: The maximal degree of a generator.
+    @param s: The number of generators.
+    @param mode: "uniform" or "weighted" sampling.
+    @param start: The number of the first ideal of the batch.
+    @return: The path of the file.
+    """
+
+    return os.path.join(path, 'n{}_d{}_s{}_{}_{:09d}.npz'.format(n, d, s, mode, start))
+
+
+def suite_settings(seed, strategies, limits):
+    """
+    Describe the settings a sweep must keep for its results to be resumed, written into every batch file.
+    @param seed: The seed of the sweep.
+    @param strategies: The names of the strategies.
+    @param limits: The dictionary of bounds, or None.
+    @return: Dictionary of strings.
+    """
+
+    return {'seed': str(seed), 'strategies': ','.join(strategies), 'limits': repr(sorted((limits or {}).items()))}
+
+
+def point_progress(path, n, d, s, mode, settings):
+    """
+    Find how many ideals of one point of a sweep are already measured, checking that they were measured with the same settings.
+    @param path: The directory of the sweep.
+    @param n: The number of variables.
+    @param d: The maximal degree of a generator.
+    @param s: The number of generators.
+    @param mode: "uniform" or "weighted" sampling.
+    @param settings: The settings of the sweep, from suite_settings.
+    @return: The number of ideals measured, the ideals of the batch files being numbered from 0 without gaps.
+    """
+
+    prefix = os.path.basename(chunk_path(path, n, d, s, mode))[:-len('000000000.npz')]
+    done = 0
+    for name in sorted(os.listdir(path)):
+        if name.startswith(prefix) and name.endswith('.npz') and not name.endswith('.tmp.npz'):
+            with np.load(os.path.join(path, name)) as data:
+                for key, value in settings.items():
+                    found = str(data[key]) if key in data.files else None
+                    assert found == value, '{} was measured with {} {}, not {}: use another directory.'.format(name, key, found, value)
+                done = max(done, int(data['start']) + int(data['count']))
+    return done
+
+
+def run_suite(path, ns, ds, ss, modes, N, strategies = tuple(STRATEGIES), processes = None, seed = 0, progress = None, chunksize = 1,
+              limits = None, batch = 64):
+    """
+    Sweep the grid of (n, d, s, mode) and measure every strategy on N ideals at each point.
+    The results of each point are written in columnar form (one array per column), a file per batch of ideals as soon as the batch is done,
+    along with the seed, the strategies and the limits. An interrupted or smaller sweep resumes from the last complete batch of each
+    point when run again with a larger or equal N, and a sweep with other settings in the same directory is refused.
+    @param path: The directory of the sweep, created if needed.
+    @param ns: The numbers of variables.
+    @param ds: The maximal degrees of a generator.
+    @param ss: The numbers of generators.
+    @param modes: The sampling modes, "uniform" or "weighted".
+    @param N: The number of ideals at each point.
+    @param strategies: The names of the strategies to run, keys of STRATEGIES.
+    @param processes: The number of worker processes, all cores by default. With 1, jobs run in the calling process.
+    @param seed: The seed of the sweep. Each point uses the same seed, so its results do not depend on the rest of the grid.
+    @param progress: Optional function called as progress(done, total) after each completed point.
+    @param chunksize: The number of jobs sent to a worker at a time.
+    @param limits: Optional dictionary of bounds for every run, among max_degree, max_pairs, max_add and time_limit of
+    buchberger.buchberger_degree, so that no ideal stalls the sweep. Only the strategies of CLASSIC accept them.
+    @param batch: The number of ideals written to a file at a time.
+    """
+
+    assert all([x in STRATEGIES for x in strategies]), 'Unknown strategy.'
+    assert not limits or all([x in CLASSIC for x in strategies]), 'Only the strategies of CLASSIC accept limits.'
+
+    os.makedirs(path, exist_ok = True)
+    settings = suite_settings(seed, strategies, limits)
+    grid = list(itertools.product(ns, ds, ss, modes))
+    for done, (n, d, s, mode) in enumerate(grid):
+        for start in range(point_progress(path, n, d, s, mode, settings), N, batch):
+            count = min(batch, N - start)
+            jobs = itertools.islice(iter_jobs(n, d, s, N, mode, seed, strategies), start * len(strategies), (start + count) * len(strategies))
+            if limits:
+                jobs = (job + (limits, ) for job in jobs)
+            rows = list(pl.imap_jobs(measure_job, jobs, processes, chunksize))
+            columns = dict([(column, np.array([row[column] for row in rows])) for column in COLUMNS])
+            # Write to a temporary file first, so an interruption never leaves a partial file behind
+            target = chunk_path(path, n, d, s, mode, start)
+            temporary = target[:-len('.npz')] + '.tmp.npz'
+            np.savez(temporary, start = start, count = count, **settings, **columns)
+            os.replace(temporary, target)
+        if progress is not None:
+            progress(done + 1, len(grid))
+
+
+def load_suite(path):
+    """
+    Load all results of a benchmark sweep.
+    @param path: The directory of the sweep.
+    @return: Dictionary mapping each of COLUMNS to an array of values, one entry per (ideal, strategy) job of every batch file.
+    Files written before the status was recorded count their runs as complete.
+    """
+
+    chunks = []
+    for name in sorted(os.listdir(path)):
+        if name.endswith('.npz') and not name.endswith('.tmp.npz'):
+            with np.load(os.path.join(path, name)) as data:
+                chunk = dict([(column, data[column]) for column in COLUMNS if column in data.files])
+                chunk.setdefault('status', np.full(len(chunk['n']), 'complete'))
+                chunks.append(chunk)
+    if len(chunks) == 0:
+        return dict([(column, np.array([])) for column in COLUMNS])
+    return dict([(column, np.concatenate([chunk[column] for chunk in chunks])) for column in COLUMNS])
@@ -0,0 +1,107 @@
+import polynomial as poly
+import reduction as rd
+import random
+
+
+def is_binomial(f):
+    """
+    Check if a polynomial has at most two terms.
+    @param f: Polynomial f.
+    @return: True if f is a binomial, a monomial or zero, False if not.
+    """
+
+    return f.nterm <= 2
+
+
+def _terms(keys, coefs, p):
+    """
+    Collect at most two terms into a list of terms in descending order, adding up equal monomials and dropping zeros.
+    @param keys: List of packed monomials.
+    @param coefs: List of integer coefficients, matching keys.
+    @param p: The characteristic of the field.
+    @return: List of (packed monomial, coefficient) tuples.
+    """
+
+    if len(keys) == 2 and keys[0] == keys[1]:
+        keys, coefs = keys[:1], [coefs[0] + coefs[1]]
+    terms = [(key, coef % p) for key, coef in zip(keys, coefs) if coef % p != 0]
+    terms.sort(reverse = True)
+    return terms
+
+
+def _polynomial(terms, f):
+    """
+    Build a polynomial from a list of terms in descending order.
+    @param terms: List of (packed monomial, coefficient) tuples.
+    @param f: A polynomial with the same variables, field and order.
+    @return: The polynomial object.
+    """
+
+    return poly.Polynomial.from_packed([coef for _, coef in terms], [key for key, _ in terms], f.nvar, f.field, f.order)
+
+
+def S(f, g):
+    """
+    Compute the S polynomial of two binomials with constant-size arithmetic on their two terms.
+    The result is the same polynomial as reduction.S.
+    @param f: Binomial f.
+    @param g: Binomial g.
+    @return: The S polynomial represented as a polynomial object, a binomial.
+    """
+
+    assert is_binomial(f) and is_binomial(g), 'The input must be binomials.'
+
+    field, packer = f.field, f.packer
+    f_keys, g_keys = f.keys, g.keys
+    f_coefs, g_coefs = f.coefs.tolist(), g.coefs.tolist()
+    lcm_fg = packer.lcm(f_keys[0], g_keys[0])
+    # Both multiples are scaled to the larger leading coefficient, so their leading terms cancel
+    coef = max(f_coefs[0], g_coefs[0])
+
+    keys, coefs = [], []
+    if len(f_keys) == 2:
+        keys.append(packer.multiply(packer.quotient(lcm_fg, f_keys[0]), f_keys[1]))
+        coefs.append(field.mul(field.div(coef, f_coefs[0]), f_coefs[1]))
+    if len(g_keys) == 2:
+        keys.append(packer.multiply(packer.quotient(lcm_fg, g_keys[0]), g_keys[1]))
+        coefs.append(-field.mul(field.div(coef, g_coefs[0]), g_coefs[1]))
+    return _polynomial(_terms(keys, coefs, field.p), f)
+
+
+def reduce_lst(f, G, index = None):
+    """
+    Compute the complete reduction of a binomial with respect to a list of binomials, with constant-size arithmetic.
+    The choices of reducers, and so the result and the number of steps, are those of reduction.reduce_lst under the same random state.
+    @param f: Binomial f.
+    @param G: list of binomials G.
+    @param index: Optional divisor index over the leading terms of G, holding the elements of G in the same order.
+    @return: The result of complete reduction represented as a polynomial object, and the number of reduction steps.
+    """
+
+    if f.is_zero():
+        return f, rd.zero_reduction_steps(G)
+
+    field, packer = f.field, f.packer
+    divides = packer.divides
+    num_add = 0
+    terms = list(zip(f.keys, f.coefs.tolist()))
+    while len(terms) > 0:
+        key, coef = terms[0]
+        if index is not None:
+            lst = index.divisors(key)
+        else:
+            lst = [g for g in G if divides(g.keys[0], key)]
+        if len(lst) == 0:
+            break
+        g = random.choice(lst)
+        assert is_binomial(g), 'The reducers must be binomials.'
+
+        # The leading term cancels, what is left is the tail of the remainder and the multiple of the tail of g
+        keys, coefs = [k for k, _ in terms[1:]], [c for _, c in terms[1:]]
+        if g.nterm == 2:
+            g_coefs = g.coefs.tolist()
+            keys.append(packer.multiply(packer.quotient(key, g.keys[0]), g.keys[1]))
+            coefs.append(-field.mul(field.div(coef, g_coefs[0]), g_coefs[1]))
+        terms = _terms(keys, coefs, field.p)
+        num_add += 1
+    return _polynomial(terms, f), num_add
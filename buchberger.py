@@ -1,130 +1,104 @@
 import polynomial as poly
-import reduction as rd
+import solver as sv
+import sampling as sp
 import finite_field as ff
 import numpy as np
-from itertools import chain
 import math
 import random
+from itertools import chain
 
 
-def buchberger_random(F):
+def buchberger_random(F, criteria = True, stats = None, reduced = False, listener = None, max_degree = None, max_pairs = None,
+                      max_add = None, time_limit = None):
     """
     The classic buchberger algorithm using random selection.
     @param F: a list of polynomials.
-    @return: The Gröbner basis of the ideal generated by F represented as a list of polynomials.
-    """
-
-    assert all([isinstance(f, poly.Polynomial) for f in F]), 'The input must be a list of polynomials.'
-
-    G = F
-    P = set([frozenset([F[i], F[j]]) for i in range(len(F)) for j in range(i + 1, len(F))])
-    counter = 1
-    num_add = 0
-    # print('------------------')
-    while len(P) > 0:
-        fg = random.sample(P, 1)[0]
-        f, g = tuple(fg)
-        # print('Iteration {}:'.format(counter))
-        # print('The choice of pair is {} and {}'.format(f, g))
-        P.remove(fg)
-        r, new_add = rd.reduce_lst(rd.S(f, g), G)
-        num_add += new_add + 1
-        # print('r is {}'.format(r))
-        if not r.is_zero():
-            P = P.union([frozenset([f, r]) for f in G])
-            G = list(set(G).union([r]))
-        counter += 1
-        # print('Total number of additions is {}'.format(num_add))
-        # print('------------------')
-
+    @param criteria: Whether to skip S-pairs eliminated by the coprime and chain criteria, which are known to reduce to zero.
+    @param stats: Optional dictionary, filled with the numbers of S-pairs reduced under 'num_pairs', of zero reductions under 'num_zero'
+    and of pruned pairs under 'num_pruned', and with the status of the run under 'status' and the number of pairs left under 'num_left'.
+    Required when a bound is given, since only the status tells a partial basis from a complete one.
+    The pruned pairs are not counted in the number of additions.
+    @param reduced: Whether to return the reduced Gröbner basis. Elements made redundant by a new leading term are then also
+    dropped from the reducers during the run. The final interreduction is not counted in the number of additions.
+    @param listener: Optional function called with the name and the data of each event of the run, see instrument.py.
+    @param max_degree: Optional degree cap, pairs whose lcm has a larger degree are not reduced and the truncated basis is returned.
+    @param max_pairs: Optional budget of S-pairs to reduce, the partial basis is returned when it runs out.
+    @param max_add: Optional budget of additions, the partial basis is returned when it runs out.
+    @param time_limit: Optional budget of wall-clock seconds, the partial basis is returned when it runs out.
+    @return: The Gröbner basis of the ideal generated by F represented as a list of polynomials, a partial basis if the status is not
+    'complete'.
+    """
+
+    assert stats is not None or (max_degree, max_pairs, max_add, time_limit) == (None, None, None, None), \
+        'Pass stats to get the status of a bounded run.'
+
+    solver = sv.Solver(F, 'random', criteria, reduced, listener)
+    G, num_add = solver.run(max_degree, max_pairs, max_add, time_limit)
+    if stats is not None:
+        solver.stats(stats)
     return G, num_add
 
 
-def remove_duplicate(lst):
-    """
-    Remove duplicates in a list and preserve order.
-    @param lst: The list from which to remove duplicates.
-    @return: A list with duplicates removed and order preserved.
-    """
-
-    seen = set()
-    seen_add = seen.add
-    return [x for x in lst if not (x in seen or seen_add(x))]
-
-
-def buchberger_first(F):
+def buchberger_first(F, criteria = True, stats = None, reduced = False, listener = None, max_degree = None, max_pairs = None,
+                     max_add = None, time_limit = None):
     """
     The classic buchberger algorithm using first selection.
     @param F: a list of polynomials.
-    @return: The Gröbner basis of the ideal generated by F represented as a list of polynomials.
-    """
-
-    assert all([isinstance(f, poly.Polynomial) for f in F]), 'The input must be a list of polynomials.'
-
-    G = F
-    P = [frozenset([F[i], F[j]]) for i in range(len(F)) for j in range(i + 1, len(F))]
-    P = remove_duplicate(P)
-    counter = 1
-    num_add = 0
-    # print('------------------')
-    while len(P) > 0:
-        fg = P.pop(0)
-        f, g = tuple(fg)
-        # print('Iteration {}:'.format(counter))
-        # print('The choice of pair is {} and {}'.format(f, g))
-        r, new_add = rd.reduce_lst(rd.S(f, g), G)
-        num_add += new_add + 1
-        # print('r is {}'.format(r))
-        if not r.is_zero():
-            for f in G:
-                P.append(frozenset([f, r]))
-            P = remove_duplicate(P)
-            G = list(set(G).union([r]))
-        counter += 1
-        # print('Total number of additions is {}'.format(num_add))
-        # print('------------------')
-
+    @param criteria: Whether to skip S-pairs eliminated by the coprime and chain criteria, which are known to reduce to zero.
+    @param stats: Optional dictionary, filled with the numbers of S-pairs reduced under 'num_pairs', of zero reductions under 'num_zero'
+    and of pruned pairs under 'num_pruned', and with the status of the run under 'status' and the number of pairs left under 'num_left'.
+    Required when a bound is given, since only the status tells a partial basis from a complete one.
+    The pruned pairs are not counted in the number of additions.
+    @param reduced: Whether to return the reduced Gröbner basis. Elements made redundant by a new leading term are then also
+    dropped from the reducers during the run. The final interreduction is not counted in the number of additions.
+    @param listener: Optional function called with the name and the data of each event of the run, see instrument.py.
+    @param max_degree: Optional degree cap, pairs whose lcm has a larger degree are not reduced and the truncated basis is returned.
+    @param max_pairs: Optional budget of S-pairs to reduce, the partial basis is returned when it runs out.
+    @param max_add: Optional budget of additions, the partial basis is returned when it runs out.
+    @param time_limit: Optional budget of wall-clock seconds, the partial basis is returned when it runs out.
+    @return: The Gröbner basis of the ideal generated by F represented as a list of polynomials, a partial basis if the status is not
+    'complete'.
+    """
+
+    assert stats is not None or (max_degree, max_pairs, max_add, time_limit) == (None, None, None, None), \
+        'Pass stats to get the status of a bounded run.'
+
+    solver = sv.Solver(F, 'first', criteria, reduced, listener)
+    G, num_add = solver.run(max_degree, max_pairs, max_add, time_limit)
+    if stats is not None:
+        solver.stats(stats)
     return G, num_add
 
 
-def buchberger_degree(F):
+def buchberger_degree(F, criteria = True, stats = None, reduced = False, listener = None, selection = 'normal', max_degree = None,
+                      max_pairs = None, max_add = None, time_limit = None):
     """
     The classic buchberger algorithm using degree selection.
     @param F: a list of polynomials.
-    @return: The Gröbner basis of the ideal generated by F represented as a list of polynomials.
-    """
-
-    assert all([isinstance(f, poly.Polynomial) for f in F]), 'The input must be a list of polynomials.'
-
-    G = F
-    P = [frozenset([F[i], F[j]]) for i in range(len(F)) for j in range(i + 1, len(F))]
-    P = remove_duplicate(P)
-    total_degree = [(list(x)[0].lt().lcm(list(x)[1].lt())).degree for x in P]
-    counter = 1
-    num_add = 0
-    # print('------------------')
-    while len(P) > 0:
-        min_degree = min(total_degree)
-        min_index = total_degree.index(min_degree)
-        fg = P[min_index]
-        P.remove(fg)
-        total_degree.remove(min_degree)
-        f, g = tuple(fg)
-        # print('Iteration {}:'.format(counter))
-        # print('The choice of pair is {} and {}'.format(f, g))
-        r, new_add = rd.reduce_lst(rd.S(f, g), G)
-        num_add += new_add + 1
-        # print('r is {}'.format(r))
-        if not r.is_zero():
-            for f in G:
-                P.append(frozenset([f, r]))
-            P = remove_duplicate(P)
-            G = list(set(G).union([r]))
-            total_degree = [(list(x)[0].lt().lcm(list(x)[1].lt())).degree for x in P]
-        counter += 1
-        # print('Total number of additions is {}'.format(num_add))
-        # print('------------------')
-
+    @param criteria: Whether to skip S-pairs eliminated by the coprime and chain criteria, which are known to reduce to zero.
+    @param stats: Optional dictionary, filled with the numbers of S-pairs reduced under 'num_pairs', of zero reductions under 'num_zero'
+    and of pruned pairs under 'num_pruned', and with the status of the run under 'status' and the number of pairs left under 'num_left'.
+    Required when a bound is given, since only the status tells a partial basis from a complete one.
+    The pruned pairs are not counted in the number of additions.
+    @param reduced: Whether to return the reduced Gröbner basis. Elements made redundant by a new leading term are then also
+    dropped from the reducers during the run. The final interreduction is not counted in the number of additions.
+    @param listener: Optional function called with the name and the data of each event of the run, see instrument.py.
+    @param selection: 'normal' to select the pair with the smallest lcm degree, 'sugar' to select the pair with the smallest sugar degree.
+    @param max_degree: Optional degree cap, pairs whose lcm has a larger degree are not reduced and the truncated basis is returned.
+    @param max_pairs: Optional budget of S-pairs to reduce, the partial basis is returned when it runs out.
+    @param max_add: Optional budget of additions, the partial basis is returned when it runs out.
+    @param time_limit: Optional budget of wall-clock seconds, the partial basis is returned when it runs out.
+    @return: The Gröbner basis of the ideal generated by F represented as a list of polynomials, a partial basis if the status is not
+    'complete'.
+    """
+
+    assert stats is not None or (max_degree, max_pairs, max_add, time_limit) == (None, None, None, None), \
+        'Pass stats to get the status of a bounded run.'
+
+    solver = sv.Solver(F, selection, criteria, reduced, listener)
+    G, num_add = solver.run(max_degree, max_pairs, max_add, time_limit)
+    if stats is not None:
+        solver.stats(stats)
     return G, num_add
 
 
@@ -141,17 +115,7 @@ def buchberger_benchmark(n, d, s, N, mode):
 
     assert all([isinstance(x, int) for x in [n, d, s, N]]), 'n, d, s, N should all be integers.'
 
-    coef_max = ff.p
-    ideals = []
-    for _ in range(N):
-        ideal = []
-        for _ in range(s):
-            if mode == 'weighted':
-                new_ideal = weighted_selection(n, d, coef_max)
-            elif mode == 'uniform':
-                new_ideal = uniform_selection(n, d, coef_max)
-            ideal.append(new_ideal)
-        ideals.append(ideal)
+    ideals = [random_ideal(n, d, s, mode) for _ in range(N)]
 
     buch_random, buch_first, buch_degree = [], [], []
     counter = 1
@@ -169,6 +133,29 @@ def buchberger_benchmark(n, d, s, N, mode):
     return buch_random, buch_first, buch_degree
 
 
+def random_ideal(n, d, s, mode):
+    """
+    Generate a binomial ideal (at most 2 terms per generator) in n variables, s generators with maximal degree d.
+    @param n: The number of variables.
+    @param d: The maximal degree of a generator.
+    @param s: The number of generators.
+    @param mode: Generate ideals using "uniform" or "weighted" sampling.
+    @return: The generators represented as a list of polynomials.
+    """
+
+    assert mode in ['weighted', 'uniform'], 'mode should be "weighted" or "uniform".'
+
+    coef_max = ff.p
+    ideal = []
+    for _ in range(s):
+        if mode == 'weighted':
+            new_ideal = weighted_selection(n, d, coef_max)
+        elif mode == 'uniform':
+            new_ideal = uniform_selection(n, d, coef_max)
+        ideal.append(new_ideal)
+    return ideal
+
+
 def weighted_selection(n, d, coef_max):
     """
     Generate a binomial using weighted selection.
@@ -182,10 +169,10 @@ def weighted_selection(n, d, coef_max):
     degree_1, degree_2 = random.randint(1, d), random.randint(1, d)
     coef_1, coef_2 = random.randint(1, coef_max - 1), random.randint(1, coef_max - 1)
     if degree_1 != degree_2:
-        monomial_1 = np.concatenate([np.array([coef_1]), np.array(random.choice(list(all_monomials(n, degree_1))))])
-        monomial_2 = np.concatenate([np.array([coef_2]), np.array(random.choice(list(all_monomials(n, degree_2))))])
+        monomial_1 = np.concatenate([np.array([coef_1]), np.array(sp.choice_monomial(n, degree_1))])
+        monomial_2 = np.concatenate([np.array([coef_2]), np.array(sp.choice_monomial(n, degree_2))])
     else:
-        monomial_1, monomial_2 = random.sample(list(all_monomials(n, degree_1)), 2)
+        monomial_1, monomial_2 = sp.sample_monomials(n, degree_1, 2)
         monomial_1 = np.concatenate([np.array([coef_1]), np.array(monomial_1)])
         monomial_2 = np.concatenate([np.array([coef_2]), np.array(monomial_2)])
 
@@ -202,7 +189,7 @@ def uniform_selection(n, d, coef_max):
     """
 
     coef_1, coef_2 = random.randint(1, coef_max - 1), random.randint(1, coef_max - 1)
-    monomial_1, monomial_2 = random.sample(list(all_monomials_up_to(n, d)), 2)
+    monomial_1, monomial_2 = sp.sample_monomials_up_to(n, d, 2)
     monomial_1 = np.concatenate([np.array([coef_1]), np.array(monomial_1)])
     monomial_2 = np.concatenate([np.array([coef_2]), np.array(monomial_2)])
 
@@ -0,0 +1,181 @@
+import monomial as mono
+
+
+# Number of bits of a divisibility mask
+DIVMASK_BITS = 64
+
+
+def divmask(exponents):
+    """
+    Compute the divisibility mask of a monomial. Each variable owns a few bits, bit j of variable i is set if e_i > j.
+    If a monomial divides another, its mask is a subset of the mask of the other.
+    @param exponents: Array of exponents.
+    @return: The mask as an integer.
+    """
+
+    nvar = len(exponents)
+    bits_per_var = max(1, DIVMASK_BITS // nvar)
+    mask = 0
+    for i, e in enumerate(exponents):
+        mask |= ((1 << min(int(e), bits_per_var)) - 1) << (i * bits_per_var)
+    return mask
+
+
+class _Node:
+    """
+    A node of the monomial trie, one level per variable.
+    """
+
+    __slots__ = ['children', 'mask', 'items']
+
+    def __init__(self):
+        self.children = {}
+        # Bitwise AND of the masks of every monomial stored below this node
+        self.mask = -1
+        self.items = []
+
+
+class DivisorIndex:
+    """
+    The divisor index keeps the leading monomials of a list of polynomials in a trie with divisibility masks,
+    and answers which polynomials have a leading term dividing a given monomial without scanning the whole list.
+    """
+
+    def __init__(self, nvar, G = (), order = None):
+        """
+        The constructor.
+        @param nvar: The number of variables.
+        @param G: Initial list of nonzero polynomials to index.
+        @param order: The monomial order of the polynomials, grevlex by default.
+        """
+
+        self.nvar = nvar
+        self.packer = mono.get_packer(nvar, order)
+        self.root = _Node()
+        # Polynomials by position, None once removed, so that positions stay valid
+        self.polys = []
+        # Positions of every indexed polynomial object, by id
+        self.positions = {}
+        self.size = 0
+        for g in G:
+            self.add(g)
+
+
+    def __getstate__(self):
+        """
+        Pickle the index without the map of positions, whose ids are only valid in the running process.
+        @return: The state of the index.
+        """
+
+        state = self.__dict__.copy()
+        del state['positions']
+        return state
+
+
+    def __setstate__(self, state):
+        """
+        Restore the index and rebuild the map of positions from the polynomials.
+        @param state: The state returned by __getstate__.
+        """
+
+        self.__dict__.update(state)
+        self.positions = {}
+        for position, g in enumerate(self.polys):
+            if g is not None:
+                self.positions.setdefault(id(g), []).append(position)
+
+
+    def __len__(self):
+        """
+        @return: The number of indexed polynomials.
+        """
+
+        return self.size
+
+
+    def add(self, g):
+        """
+        Add a polynomial to the index. Polynomials are reported in the order they were added.
+        @param g: A nonzero polynomial.
+        @return: The position of g in the index.
+        """
+
+        assert not g.is_zero(), 'Cannot index the zero polynomial.'
+
+        position = len(self.polys)
+        self.polys.append(g)
+        self.positions.setdefault(id(g), []).append(position)
+        self.size += 1
+        exponents = self.packer.unpack([g.lm])[0].tolist()
+        mask = g.divmask
+        node = self.root
+        node.mask &= mask
+        for e in exponents:
+            if e not in node.children:
+                node.children[e] = _Node()
+            node = node.children[e]
+            node.mask &= mask
+        node.items.append(position)
+        return position
+
+
+    def remove(self, g):
+        """
+        Remove a polynomial from the index, releasing it and the trie nodes left empty.
+        @param g: A polynomial previously added to the index.
+        """
+
+        positions = self.positions[id(g)]
+        position = positions.pop(0)
+        if len(positions) == 0:
+            del self.positions[id(g)]
+        self.polys[position] = None
+        self.size -= 1
+
+        exponents = self.packer.unpack([g.lm])[0].tolist()
+        path = [self.root]
+        for e in exponents:
+            path.append(path[-1].children[e])
+        path[-1].items.remove(position)
+        # Masks above stay as they are: with fewer monomials below, they only become less selective, never wrong
+        for parent, e, child in zip(path[-2::-1], exponents[::-1], path[:0:-1]):
+            if len(child.items) > 0 or len(child.children) > 0:
+                break
+            del parent.children[e]
+
+
+    def divisors(self, key):
+        """
+        Find the indexed polynomials whose leading monomial divides a monomial.
+        @param key: The packed monomial.
+        @return: List of polynomials in the order they were added.
+        """
+
+        return [self.polys[i] for i in self.divisor_positions(key)]
+
+
+    def divisor_positions(self, key):
+        """
+        Find the positions of the indexed polynomials whose leading monomial divides a monomial.
+        @param key: The packed monomial.
+        @return: Sorted list of positions, as returned by add.
+        """
+
+        exponents = self.packer.unpack([key])[0].tolist()
+        mask = divmask(exponents)
+        positions = []
+        stack = [(self.root, 0)]
+        while len(stack) > 0:
+            node, level = stack.pop()
+            # Every monomial below the node has a bit that the monomial lacks, so none of them divides it
+            if node.mask & ~mask:
+                continue
+            if level == self.nvar:
+                positions.extend(node.items)
+                continue
+            bound = exponents[level]
+            for e, child in node.children.items():
+                if e <= bound:
+                    stack.append((child, level + 1))
+        positions.sort()
+        return positions
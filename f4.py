@@ -0,0 +1,148 @@
+import polynomial as poly
+import basis as bs
+import divisor as dv
+import pairs as pq
+import numpy as np
+
+
+def row_reduce(M, field):
+    """
+    Bring a matrix to reduced row echelon form modulo p in place, with vectorized row operations.
+    @param M: 2-D integer array with entries in [0, p).
+    @param field: The coefficient field.
+    @return: The list of pivot columns, and the number of row additions performed.
+    """
+
+    nrows, ncols = M.shape
+    pivots = []
+    num_add = 0
+    pivot_row = 0
+    for col in range(ncols):
+        if pivot_row == nrows:
+            break
+        candidates = np.flatnonzero(M[pivot_row:, col])
+        if len(candidates) == 0:
+            continue
+        row = pivot_row + candidates[0]
+        if row != pivot_row:
+            M[[pivot_row, row]] = M[[row, pivot_row]]
+        M[pivot_row, col:] = field.mul(M[pivot_row, col:], field.inv(int(M[pivot_row, col])))
+
+        # Eliminate the pivot column from every other row at once, each row counts as one addition
+        others = np.flatnonzero(M[:, col])
+        others = others[others != pivot_row]
+        if len(others) > 0:
+            M[others, col:] = field.sub(M[others, col:], np.outer(M[others, col], M[pivot_row, col:]))
+            num_add += len(others)
+        pivots.append(col)
+        pivot_row += 1
+
+    return pivots, num_add
+
+
+def symbolic_preprocessing(rows, index):
+    """
+    Add to the rows the multiples of basis elements needed to reduce every monomial that appears in them.
+    @param rows: Dictionary mapping (basis element, packed multiplier) to the packed monomials of the row, modified in place.
+    @param index: Divisor index over the leading terms of the basis.
+    @return: The set of all packed monomials appearing in the rows.
+    """
+
+    done = set([keys[0] for keys in rows.values()])
+    monomials = set()
+    for keys in rows.values():
+        monomials.update(keys)
+    todo = list(monomials - done)
+    while len(todo) > 0:
+        key = todo.pop()
+        if key in done:
+            continue
+        done.add(key)
+        divisors = index.divisors(key)
+        if len(divisors) == 0:
+            continue
+        g = divisors[0]
+        packer = g.packer
+        multiplier = packer.quotient(key, g.keys[0])
+        if (g, multiplier) in rows:
+            continue
+        keys = [packer.multiply(multiplier, k) for k in g.keys]
+        rows[(g, multiplier)] = keys
+        for k in keys[1:]:
+            if k not in monomials:
+                monomials.add(k)
+                todo.append(k)
+
+    return monomials
+
+
+def buchberger_f4(F, criteria = True, stats = None):
+    """
+    An F4-style variant of Buchberger's algorithm. All S-pairs of minimal lcm degree are reduced together by building
+    the Macaulay matrix of their S-polynomials and of the reducers they need, and row reducing it modulo p.
+    The number of additions counts the row operations, each adding a multiple of a pivot row to another row,
+    which is the matrix analogue of one reduction step.
+    @param F: a list of polynomials.
+    @param criteria: Whether to skip S-pairs eliminated by the coprime and chain criteria, which are known to reduce to zero.
+    @param stats: Optional dictionary, filled with the numbers of S-pairs reduced under 'num_pairs', of rows reduced to zero under 'num_zero'
+    and of pruned pairs under 'num_pruned'.
+    @return: The Gröbner basis of the ideal generated by F represented as a list of polynomials.
+    """
+
+    assert all([isinstance(f, poly.Polynomial) for f in F]), 'The input must be a list of polynomials.'
+
+    G = bs.remove_duplicate(F)
+    nvar = F[0].nvar
+    packer = F[0].packer
+    field = F[0].field
+    index = dv.DivisorIndex(nvar, G, F[0].order)
+    P = pq.PairQueue(G, 'normal')
+    initial, num_pruned = bs.initial_pairs(G, criteria)
+    P.extend(initial)
+    num_add = 0
+    num_pairs = 0
+    num_zero = 0
+
+    while len(P) > 0:
+        # Select every pair of the minimal degree
+        degree = P.peek_priority()
+        selected = []
+        while len(P) > 0 and P.peek_priority() == degree:
+            selected.append(P.pop())
+        num_pairs += len(selected)
+
+        # Both multiples of each S-pair go into the matrix, their difference is the S-polynomial
+        rows = {}
+        for i, j in selected:
+            f, g = G[i], G[j]
+            lcm_fg = packer.lcm(f.keys[0], g.keys[0])
+            for h in (f, g):
+                multiplier = packer.quotient(lcm_fg, h.keys[0])
+                if (h, multiplier) not in rows:
+                    rows[(h, multiplier)] = [packer.multiply(multiplier, k) for k in h.keys]
+        monomials = symbolic_preprocessing(rows, index)
+        leading = set([keys[0] for keys in rows.values()])
+
+        # Columns in descending monomial order
+        columns = sorted(monomials, reverse = True)
+        position = dict([(key, i) for i, key in enumerate(columns)])
+        M = np.zeros((len(rows), len(columns)), dtype = np.int64)
+        for i, ((h, _), keys) in enumerate(rows.items()):
+            M[i, [position[k] for k in keys]] = h.coefs
+        pivots, new_add = row_reduce(M, field)
+        num_add += new_add
+        num_zero += len(rows) - len(pivots)
+
+        # The rows whose leading monomial is new are added to the basis
+        for i, col in enumerate(pivots):
+            if columns[col] in leading:
+                continue
+            nonzero = np.flatnonzero(M[i])
+            r = poly.Polynomial.from_packed(M[i, nonzero], [columns[j] for j in nonzero], nvar, field, F[0].order)
+            num_pruned += bs.add_to_basis(G, P, r, index, criteria)
+
+    if stats is not None:
+        stats['num_pairs'] = num_pairs
+        stats['num_zero'] = num_zero
+        stats['num_pruned'] = num_pruned
+    return G, num_add
@@ -1,9 +1,185 @@
 import numpy as np
+from functools import lru_cache
 
 
 # The choice of p
 p = 23
 
+# Log/exp and inverse tables are precomputed for primes up to this size
+TABLE_MAX = 1 << 16
+
+
+class FiniteField:
+    """
+    The finite field Z/pZ for a prime p. All operations accept integers or NumPy integer arrays,
+    and arrays are processed in one vectorized operation.
+    """
+
+    def __init__(self, p):
+        """
+        The constructor. For small p, tables of discrete logarithms, powers of a primitive root and inverses are precomputed.
+        @param p: The prime. Products of two field elements should fit in 64 bits, so p must be below 2^31.
+        """
+
+        assert isinstance(p, (int, np.integer)) and 2 <= p < (1 << 31), 'p should be an integer in [2, 2^31)'
+        assert all([p % q != 0 for q in range(2, int(p ** 0.5) + 1)]), 'p should be a prime'
+
+        self.p = int(p)
+        self.log = None
+        self.exp = None
+        self.inverses = None
+        if self.p <= TABLE_MAX:
+            root = primitive_root(self.p)
+            self.exp = np.ones(self.p - 1, dtype = np.int64)
+            for i in range(1, self.p - 1):
+                self.exp[i] = (self.exp[i - 1] * root) % self.p
+            self.log = np.zeros(self.p, dtype = np.int64)
+            self.log[self.exp] = np.arange(self.p - 1)
+            self.inverses = np.zeros(self.p, dtype = np.int64)
+            self.inverses[1:] = self.exp[(-self.log[1:]) % (self.p - 1)]
+
+
+    def __repr__(self):
+        """
+        @return: The field printed in string.
+        """
+
+        return 'FiniteField({})'.format(self.p)
+
+
+    def __eq__(self, other):
+        """
+        @return: True if both fields have the same prime, False if not.
+        """
+
+        return isinstance(other, FiniteField) and self.p == other.p
+
+
+    def __hash__(self):
+        """
+        @return: The hash of the field.
+        """
+
+        return hash(('FiniteField', self.p))
+
+
+    def __reduce__(self):
+        """
+        Pickle the field through get_field, so the tables are shared and not serialized.
+        """
+
+        return (get_field, (self.p, ))
+
+
+    def add(self, a, b):
+        """
+        Compute the sum of two numbers or arrays in the field.
+        @param a: One number or array.
+        @param b: Another number or array.
+        @return: The sum.
+        """
+
+        return (a + b) % self.p
+
+
+    def sub(self, a, b):
+        """
+        Compute the difference of two numbers or arrays in the field.
+        @param a: One number or array.
+        @param b: Another number or array.
+        @return: The difference.
+        """
+
+        return (a - b) % self.p
+
+
+    def mul(self, a, b):
+        """
+        Compute the product of two numbers or arrays in the field.
+        @param a: One number or array.
+        @param b: Another number or array.
+        @return: The product.
+        """
+
+        return (a * b) % self.p
+
+
+    def inv(self, a):
+        """
+        Compute the inverse of a nonzero number or of an array of nonzero numbers in the field.
+        Zero has no inverse, with or without the inverse tables.
+        @param a: A number or array.
+        @return: The inverse.
+        """
+
+        if np.ndim(a) == 0:
+            a = int(a) % self.p
+            if a == 0:
+                raise ZeroDivisionError('Zero has no inverse in the field.')
+            return int(self.inverses[a]) if self.inverses is not None else pow(a, -1, self.p)
+        a = np.mod(a, self.p)
+        if (a == 0).any():
+            raise ZeroDivisionError('Zero has no inverse in the field.')
+        if self.inverses is not None:
+            return self.inverses[a]
+        return np.array([pow(int(x), -1, self.p) for x in np.ravel(a)], dtype = np.int64).reshape(np.shape(a))
+
+
+    def div(self, a, b):
+        """
+        Compute the ratio of two numbers or arrays in the field.
+        @param a: One number or array.
+        @param b: Another number or array of nonzero numbers.
+        @return: The ratio.
+        """
+
+        return self.mul(a, self.inv(b))
+
+
+def primitive_root(p):
+    """
+    Find the smallest primitive root modulo a prime.
+    @param p: The prime.
+    @return: The primitive root.
+    """
+
+    if p == 2:
+        return 1
+    factors = []
+    n, q = p - 1, 2
+    while q * q <= n:
+        if n % q == 0:
+            factors.append(q)
+            while n % q == 0:
+                n //= q
+        q += 1
+    if n > 1:
+        factors.append(n)
+    for g in range(2, p):
+        if all([pow(g, (p - 1) // q, p) != 1 for q in factors]):
+            return g
+
+
+@lru_cache(maxsize = None)
+def get_field(p):
+    """
+    Get the shared field object for a prime.
+    @param p: The prime.
+    @return: The field object.
+    """
+
+    return FiniteField(p)
+
+
+def default_field():
+    """
+    Get the field for the current module-level choice of p.
+    @return: The field object.
+    """
+
+    return get_field(p)
+
+
 def ff_add(a, b):
     """
     Compute the sum of two numbers in the finite field Z/pZ.
@@ -43,13 +219,4 @@ def ff_inv(a):
     @return: The inverse.
     """
 
-    t, r, new_t, new_r = 0, p, 1, a % p
-    while new_r != 0:
-        q = r // new_r
-        t, new_t = new_t, t - q * new_t
-        r, new_r = new_r, r - q * new_r
-
-    if t < 0:
-        t = t % p
-
-    return t
+    return default_field().inv(a)
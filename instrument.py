@@ -0,0 +1,120 @@
+import polynomial as poly
+
+
+# The events reported by the solver to its listener, each with a dictionary of data:
+# 'pair_selected': the pair, the degree of the lcm of its leading terms, and the time spent popping it from the queue.
+# 'reduction_started': the pair, the number of terms and the degree of its S-polynomial, and the time spent computing it.
+# 'reduction_finished': the pair, the number of terms and the degree of the remainder, the number of additions, and the time spent reducing.
+# 'zero_reduction': the pair.
+# 'basis_grown': the position, the number of terms and the degree of the new element, the size of the basis, and the time spent updating the pairs.
+# 'pairs_pruned': the number of pairs eliminated by the criteria.
+EVENTS = ('pair_selected', 'reduction_started', 'reduction_finished', 'zero_reduction', 'basis_grown', 'pairs_pruned')
+
+
+class Recorder:
+    """
+    A listener keeping every event in a list, in the order they were reported.
+    """
+
+    def __init__(self):
+        """
+        The constructor.
+        """
+
+        self.events = []
+
+
+    def __call__(self, event, data):
+        """
+        Record an event.
+        @param event: The name of the event, one of EVENTS.
+        @param data: Dictionary of data of the event.
+        """
+
+        self.events.append((event, data))
+
+
+class Profile:
+    """
+    A listener aggregating the events of one or more runs: the number of each event, and the time spent computing S-polynomials,
+    reducing them, managing the pairs and, while the profile is active as a context manager, building polynomials.
+    Building polynomials happens inside the other phases, so its time overlaps theirs.
+    """
+
+    def __init__(self):
+        """
+        The constructor.
+        """
+
+        self.counts = dict([(event, 0) for event in EVENTS])
+        self.times = {'S': 0.0, 'reduce_lst': 0.0, 'pairs': 0.0, 'Polynomial': 0.0}
+        self.num_add = 0
+        self.num_pruned = 0
+        self.num_polynomials = 0
+        self.max_degree = 0
+        self.max_nterm = 0
+        self._construction = None
+        self._previous = None
+
+
+    def __call__(self, event, data):
+        """
+        Aggregate an event.
+        @param event: The name of the event, one of EVENTS.
+        @param data: Dictionary of data of the event.
+        """
+
+        self.counts[event] += 1
+        if event == 'pair_selected':
+            self.times['pairs'] += data['time']
+        elif event == 'reduction_started':
+            self.times['S'] += data['time']
+        elif event == 'reduction_finished':
+            self.times['reduce_lst'] += data['time']
+            self.num_add += data['num_add']
+        elif event == 'basis_grown':
+            self.times['pairs'] += data['time']
+            self.max_degree = max(self.max_degree, data['degree'])
+            self.max_nterm = max(self.max_nterm, data['nterm'])
+        elif event == 'pairs_pruned':
+            self.num_pruned += data['count']
+
+
+    def __enter__(self):
+        """
+        Start timing the construction of polynomials.
+        @return: The profile.
+        """
+
+        self._previous = poly.construction_time
+        self._construction = [0, 0.0]
+        poly.construction_time = self._construction
+        return self
+
+
+    def __exit__(self, *exc):
+        """
+        Stop timing the construction of polynomials.
+        """
+
+        poly.construction_time = self._previous
+        self.num_polynomials += self._construction[0]
+        self.times['Polynomial'] += self._construction[1]
+        self._construction = None
+
+
+    def report(self):
+        """
+        Summarize the profile.
+        @return: The profile printed in string, one line per event and per timed phase.
+        """
+
+        lines = ['{:<20}{:>12}'.format(event, self.counts[event]) for event in EVENTS]
+        lines.append('{:<20}{:>12}'.format('additions', self.num_add))
+        lines.append('{:<20}{:>12}'.format('pruned pairs', self.num_pruned))
+        lines.append('{:<20}{:>12}'.format('polynomials built', self.num_polynomials))
+        lines.append('{:<20}{:>12}'.format('max degree', self.max_degree))
+        lines.append('{:<20}{:>12}'.format('max terms', self.max_nterm))
+        for phase, seconds in self.times.items():
+            lines.append('{:<20}{:>11.4f}s'.format(phase, seconds))
+        return '\n'.join(lines)
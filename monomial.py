@@ -0,0 +1,236 @@
+import numpy as np
+import order as od
+from functools import lru_cache
+
+
+# Layout of a packed monomial in n variables, from the most significant bits down:
+# [weighted degrees of the order | field(x_n) | ... | field(x_1)], every field being FIELD_BITS wide and every weighted degree
+# 16 or 32 bits wide, the narrowest width holding its largest value. A field stores exponent_max - e_i below a guard bit on top,
+# where exponent_max is the largest exponent of the packer.
+# The weighted degrees compare first, and storing the complemented exponents breaks their ties in reverse lexicographic order,
+# so integer comparison of packed monomials agrees with the monomial order. For grevlex, the only weighted degree is the total degree.
+FIELD_BITS = 16
+GUARD_BIT = 1 << (FIELD_BITS - 1)
+FIELD_MOD = (1 << FIELD_BITS) - 1
+# The sum of two complemented exponents must stay below the guard bit, which bounds the exponents by 2^14 - 1.
+# The packer lowers the bound further so that the sum of the n complemented exponents fits in one field (see degree).
+EXPONENT_MAX = (1 << (FIELD_BITS - 2)) - 1
+
+
+class Packer:
+    """
+    The packer class converts exponent vectors in a fixed number of variables to and from packed integers,
+    and implements the monomial operations needed by Buchberger's algorithm directly on packed integers.
+    """
+
+    def __init__(self, nvar, order = None):
+        """
+        The constructor.
+        @param nvar: The number of variables.
+        @param order: The monomial order as an order.MonomialOrder, grevlex by default.
+        """
+
+        assert isinstance(nvar, int) and nvar > 0, 'The number of variables should be a positive integer'
+
+        self.nvar = nvar
+        self.order = od.get_order(order)
+        self.exponent_max = min(EXPONENT_MAX, (FIELD_MOD - 1) // nvar)
+        self.shift = nvar * FIELD_BITS
+        self.ones = sum(1 << (FIELD_BITS * i) for i in range(nvar))
+        self.guards = GUARD_BIT * self.ones
+        self.values = self.exponent_max * self.ones
+        self.fields = (1 << self.shift) - 1
+        self.max_sum = nvar * self.exponent_max
+
+        # Weighted degrees with negative weights are stored with an offset, so that every word stays non-negative
+        self.rows = self.order.rows(nvar)
+        self.offsets = self.exponent_max * np.maximum(-self.rows, 0).sum(axis = 1)
+        row_max = int((self.offsets + self.exponent_max * np.abs(self.rows).sum(axis = 1)).max())
+        assert row_max < 1 << 32, 'The weights are too large to pack.'
+        self.row_bits = 16 if row_max < 1 << 16 else 32
+        self.nrows = len(self.rows)
+        self.nbytes = (nvar * FIELD_BITS + self.nrows * self.row_bits) // 8
+        self.top_shift = self.shift + (self.nrows - 1) * self.row_bits
+        # Whether the most significant weighted degree is the total degree, as for grevlex
+        self.graded = bool((self.rows[0] == 1).all())
+
+        # A packed monomial is an affine function of the exponents: base + sum of e_i * columns[i]
+        shifts = [self.shift + (self.nrows - 1 - k) * self.row_bits for k in range(self.nrows)]
+        self.base = self.values + sum([int(offset) << s for offset, s in zip(self.offsets, shifts)])
+        self.columns = [sum([int(w) << s for w, s in zip(self.rows[:, i], shifts)]) - (1 << (FIELD_BITS * i)) for i in range(nvar)]
+
+
+    def pack(self, exps):
+        """
+        Pack a batch of exponent vectors.
+        @param exps: 2-D array of non-negative integer exponents, one row per monomial.
+        @return: List of packed monomials. OverflowError is raised if an exponent is above exponent_max.
+        """
+
+        exps = np.asarray(exps, dtype=np.int64).reshape(-1, self.nvar)
+        assert (exps >= 0).all(), 'Exponents should be non-negative integers'
+        if (exps > self.exponent_max).any():
+            raise OverflowError('Exponents above {} do not fit in a packed monomial in {} variables.'.format(self.exponent_max, self.nvar))
+
+        # Little-endian bytes of every monomial: the narrow fields first, then the weighted degrees
+        fields = (self.exponent_max - exps).astype('<u2').view(np.uint8)
+        rows = (exps @ self.rows.T + self.offsets)[:, ::-1].astype('<u{}'.format(self.row_bits // 8)).view(np.uint8)
+        buf = np.hstack([fields, rows]).tobytes()
+        nbytes = self.nbytes
+        return [int.from_bytes(buf[i:i + nbytes], 'little') for i in range(0, len(buf), nbytes)]
+
+
+    def pack_one(self, exponents):
+        """
+        Pack a single exponent vector.
+        @param exponents: Array of non-negative integer exponents.
+        @return: The packed monomial.
+        """
+
+        return self.pack(exponents)[0]
+
+
+    def unpack(self, keys):
+        """
+        Unpack a batch of packed monomials.
+        @param keys: Iterable of packed monomials.
+        @return: 2-D array of exponents, one row per monomial.
+        """
+
+        nbytes = self.nbytes
+        buf = b''.join([key.to_bytes(nbytes, 'little') for key in keys])
+        fields = np.frombuffer(buf, dtype=np.uint8).reshape(-1, nbytes)[:, :self.nvar * FIELD_BITS // 8]
+        return self.exponent_max - np.ascontiguousarray(fields).view('<u2').astype(np.int64)
+
+
+    def sort_keys(self, exps):
+        """
+        Compute the sort keys of a batch of exponent vectors for np.lexsort, which sorts them in descending order.
+        @param exps: 2-D array of exponents, one row per monomial.
+        @return: 2-D array of keys, the last row being the primary key.
+        """
+
+        return np.vstack([exps.T, -(self.rows[::-1] @ exps.T)])
+
+
+    def degree(self, a):
+        """
+        Get the total degree of a packed monomial.
+        @param a: The packed monomial.
+        @return: The total degree.
+        """
+
+        if self.graded:
+            return a >> self.top_shift
+        # The sum of all fields fits in one field, so it can be read off modulo 2^FIELD_BITS - 1
+        return self.max_sum - (a & self.fields) % FIELD_MOD
+
+
+    def divides(self, a, b):
+        """
+        Check if one packed monomial divides another.
+        @param a: The packed divisor.
+        @param b: The packed dividend.
+        @return: True if a divides b, False if not.
+        """
+
+        # e_a <= e_b in every variable iff no field of (complement of a) - (complement of b) borrows from its guard bit
+        return (((a & self.fields) | self.guards) - (b & self.fields)) & self.guards == self.guards
+
+
+    def multiply(self, a, b):
+        """
+        Multiply two packed monomials.
+        @param a: One packed monomial.
+        @param b: Another packed monomial.
+        @return: The packed product. OverflowError is raised if an exponent of the product is above exponent_max.
+        """
+
+        if not self.graded or (a >> self.top_shift) + (b >> self.top_shift) > self.exponent_max:
+            fields = (a & self.fields) + (b & self.fields)
+            if ((fields | self.guards) - self.values) & self.guards != self.guards:
+                raise OverflowError('The product has an exponent above {}, which does not fit in a packed monomial in {} variables.'
+                                    .format(self.exponent_max, self.nvar))
+
+        return a + b - self.base
+
+
+    def quotient(self, a, b):
+        """
+        Divide one packed monomial by another, assuming that the division is exact.
+        @param a: The packed dividend.
+        @param b: The packed divisor.
+        @return: The packed quotient.
+        """
+
+        return a - b + self.base
+
+
+    def lcm(self, a, b):
+        """
+        Compute the least common multiple of two packed monomials.
+        @param a: One packed monomial.
+        @param b: Another packed monomial.
+        @return: The packed least common multiple.
+        """
+
+        field_a = a & self.fields
+        field_b = b & self.fields
+        # Guard bits survive exactly in the fields where a has the smaller exponent, spread them into value masks
+        larger = ((field_a | self.guards) - field_b) & self.guards
+        mask = larger - (larger >> (FIELD_BITS - 1))
+        fields = (field_b & mask) | (field_a & (self.fields ^ mask))
+        if self.nrows == 1 and self.graded:
+            # The sum of all fields fits in one field, so it can be read off modulo 2^FIELD_BITS - 1
+            degree = self.max_sum - fields % FIELD_MOD
+            return (degree << self.shift) | fields
+
+        # Otherwise the lcm is a times the part of b exceeding it
+        excess = 0
+        for i, column in enumerate(self.columns):
+            e = ((field_a >> (FIELD_BITS * i)) & FIELD_MOD) - ((fields >> (FIELD_BITS * i)) & FIELD_MOD)
+            if e > 0:
+                excess += e * column
+        return a + excess
+
+
+    def is_coprime(self, a, b):
+        """
+        Check if two packed monomials share no variable.
+        @param a: One packed monomial.
+        @param b: Another packed monomial.
+        @return: True if the two monomials are coprime, False if not.
+        """
+
+        return self.degree(self.lcm(a, b)) == self.degree(a) + self.degree(b)
+
+
+@lru_cache(maxsize = None)
+def _get_packer(nvar, order):
+    """
+    Get the shared packer for monomials in nvar variables under an order object.
+    """
+
+    return Packer(nvar, order)
+
+
+def get_packer(nvar, order = None):
+    """
+    Get the shared packer for monomials in nvar variables.
+    @param nvar: The number of variables.
+    @param order: The monomial order, grevlex by default.
+    @return: The packer object.
+    """
+
+    return _get_packer(nvar, od.get_order(order))
+
+
+def compare_packed(a, b):
+    """
+    Compare two packed monomials under the monomial order of their packer.
+    @param a: The 1st packed monomial.
+    @param b: The 2nd packed monomial.
+    @return: 1 if a is larger, -1 if b is larger, 0 if they are the same.
+    """
+
+    return (a > b) - (a < b)
@@ -0,0 +1,203 @@
+import polynomial as poly
+import buchberger as buch
+import finite_field as ff
+import order as od
+import parallel as pl
+from collections import Counter
+from fractions import Fraction
+import math
+
+
+# The largest prime the finite fields accept, primes are taken going down from it
+PRIME_MAX = (1 << 31) - 1
+
+
+def is_prime(n):
+    """
+    Check if an integer is a prime with the deterministic Miller-Rabin test, exact below 3.3 * 10^24.
+    @param n: The integer.
+    @return: True if n is a prime, False if not.
+    """
+
+    if n < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for q in bases:
+        if n % q == 0:
+            return n == q
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def primes_below(n, count):
+    """
+    List the largest primes below a bound.
+    @param n: The exclusive bound.
+    @param count: The number of primes.
+    @return: List of primes in descending order.
+    """
+
+    primes = []
+    while len(primes) < count:
+        n -= 1
+        assert n >= 2, 'Not enough primes below the bound.'
+        if is_prime(n):
+            primes.append(n)
+    return primes
+
+
+def leading_exponents(monomials, order = None):
+    """
+    Find the leading monomial of a polynomial with integer coefficients.
+    @param monomials: Rows of the polynomial in the layout of the Polynomial constructor, the integer coefficient followed by the exponents.
+    @param order: The monomial order, grevlex by default.
+    @return: The exponents of the leading monomial as a tuple, None for the zero polynomial.
+    """
+
+    order = od.get_order(order)
+    terms = {}
+    for row in monomials:
+        exps = tuple([int(e) for e in row[1:]])
+        terms[exps] = terms.get(exps, 0) + int(row[0])
+    nonzero = [exps for exps, coef in terms.items() if coef != 0]
+    return max(nonzero, key = order.key) if len(nonzero) > 0 else None
+
+
+def modular_basis(job):
+    """
+    Compute the reduced Gröbner basis of the image of an ideal with integer coefficients modulo a prime.
+    @param job: Tuple of the prime, the generators in the layout of the Polynomial constructor and the order.
+    @return: The prime, and the reduced Gröbner basis over Z/pZ as a list of polynomials, None if the prime divides a leading coefficient.
+    """
+
+    p, F, order = job
+    field = ff.get_field(p)
+    images = []
+    for f in F:
+        rows = [[int(row[0]) % p] + [int(e) for e in row[1:]] for row in f]
+        image = poly.Polynomial(rows, field, order)
+        if image.is_zero() or tuple(image.exps[0].tolist()) != leading_exponents(f, order):
+            return p, None
+        images.append(image)
+    G, _ = buch.buchberger_degree(images, reduced = True)
+    return p, G
+
+
+def crt(a, m, b, p):
+    """
+    Combine two congruences with the Chinese remainder theorem.
+    @param a: The residue modulo m.
+    @param m: The first modulus.
+    @param b: The residue modulo p.
+    @param p: The second modulus, coprime to m.
+    @return: The residue modulo m * p congruent to a modulo m and to b modulo p.
+    """
+
+    return a + m * ((b - a) * pow(m, -1, p) % p)
+
+
+def rational_reconstruction(a, m):
+    """
+    Find the fraction r / s congruent to a modulo m with |r| and s at most sqrt(m / 2), with the extended Euclidean algorithm.
+    @param a: The residue.
+    @param m: The modulus.
+    @return: The fraction, None if there is none.
+    """
+
+    bound = math.isqrt(m // 2)
+    r0, r1 = m, a % m
+    s0, s1 = 0, 1
+    while r1 > bound:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        s0, s1 = s1, s0 - q * s1
+    if s1 == 0 or abs(s1) > bound or math.gcd(s1, m) != 1:
+        return None
+    return Fraction(r1, s1)
+
+
+def lift(images):
+    """
+    Lift reduced Gröbner bases over several primes, with the same leading monomials, to a basis over the rationals.
+    @param images: List of (prime, reduced Gröbner basis) pairs.
+    @return: The basis as a list of polynomials over Q, each a list of (coefficient, exponents) terms in descending order,
+    None if some coefficient has no rational reconstruction yet.
+    """
+
+    modulus = 1
+    residues = [{} for _ in images[0][1]]
+    for p, G in images:
+        for terms, g in zip(residues, G):
+            coefs = dict(zip(g.keys, g.coefs.tolist()))
+            # A monomial missing from one image has a coefficient divisible by that prime
+            for key in set(terms) | set(coefs):
+                terms[key] = crt(terms.get(key, 0), modulus, coefs.get(key, 0), p)
+        modulus *= p
+
+    basis = []
+    packer = images[0][1][0].packer
+    for terms in residues:
+        g = []
+        for key in sorted(terms, reverse = True):
+            coef = rational_reconstruction(terms[key], modulus)
+            if coef is None:
+                return None
+            if coef != 0:
+                g.append((coef, tuple(packer.unpack([key])[0].tolist())))
+        basis.append(g)
+    return basis
+
+
+def rational_basis(F, order = None, batch = 4, max_primes = 64, processes = None):
+    """
+    Compute the reduced Gröbner basis over the rationals of an ideal with integer coefficients by multi-modular computation.
+    The basis is computed modulo batches of word-sized primes on a process pool. Primes dividing a leading coefficient of a generator,
+    and primes whose basis has leading monomials other than the most common ones, are rejected as unlucky. The remaining bases are
+    combined with the Chinese remainder theorem, and the coefficients recovered by rational reconstruction, until the result is
+    the same after a new batch of primes.
+    @param F: List of generators, each given by rows in the layout of the Polynomial constructor, an integer coefficient followed by the exponents.
+    @param order: The monomial order, grevlex by default.
+    @param batch: The number of primes added at each round.
+    @param max_primes: The maximal number of primes to use.
+    @param processes: The number of worker processes, all cores by default. With 1, the primes are processed in the calling process.
+    @return: The reduced Gröbner basis over Q as a list of polynomials, each a list of (Fraction coefficient, exponents) terms
+    in descending order. RuntimeError is raised if the result has not stabilized within max_primes primes.
+    """
+
+    order = od.get_order(order)
+    F = [[[int(x) for x in row] for row in f] for f in F]
+    assert all([leading_exponents(f, order) is not None for f in F]), 'The generators should be nonzero.'
+
+    primes = primes_below(PRIME_MAX + 1, max_primes)
+    images = []
+    previous = None
+    for start in range(0, max_primes, batch):
+        jobs = [(p, F, order) for p in primes[start:start + batch]]
+        images.extend([(p, G) for p, G in pl.imap_jobs(modular_basis, jobs, processes) if G is not None])
+        if len(images) == 0:
+            continue
+
+        # The lucky primes share the leading monomials of the basis over Q, take the most common pattern
+        patterns = [tuple([g.keys[0] for g in G]) for _, G in images]
+        pattern = Counter(patterns).most_common(1)[0][0]
+        images = [image for image, other in zip(images, patterns) if other == pattern]
+
+        basis = lift(images)
+        if basis is not None and basis == previous:
+            return basis
+        previous = basis
+
+    raise RuntimeError('The reconstruction did not stabilize with {} primes.'.format(max_primes))
@@ -0,0 +1,160 @@
+import polynomial as poly
+import basis as bs
+import divisor as dv
+import reduction as rd
+import parallel as pl
+from collections import OrderedDict
+
+
+class NormalForm:
+    """
+    Normal forms with respect to a fixed Gröbner basis. The basis is reduced once, so its elements are monic and every term is
+    reduced by the first element, in order of leading term, whose leading term divides it: the results do not depend on the random state.
+    The normal forms of the monomials met as terms of the queries are kept in a least recently used cache and added up, with their
+    coefficients, to get the normal forms of later queries sharing these monomials.
+    """
+
+    def __init__(self, G, cache_size = 1 << 16):
+        """
+        The constructor.
+        @param G: A Gröbner basis represented as a nonempty list of polynomials.
+        @param cache_size: The maximal number of monomial normal forms kept.
+        """
+
+        assert all([isinstance(g, poly.Polynomial) for g in G]), 'The input must be a list of polynomials.'
+        assert any([not g.is_zero() for g in G]), 'The basis should have a nonzero element.'
+
+        self.G = bs.reduced_basis(G)
+        self.nvar = self.G[0].nvar
+        self.field = self.G[0].field
+        self.order = self.G[0].order
+        self.packer = self.G[0].packer
+        self.index = dv.DivisorIndex(self.nvar, self.G, self.order)
+        self.cache_size = cache_size
+        # Packed monomial -> its normal form as a tuple of descending packed monomials and a tuple of coefficients
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def _reduce_terms(self, f):
+        """
+        Fully reduce a polynomial with the term heap of reduction.py, using the cached normal forms of its terms when there are any.
+        @param f: Polynomial f, with the variables, field and order of the basis.
+        @return: Dictionary from the packed monomials of the normal form to their nonzero coefficients.
+        """
+
+        p = self.field.p
+        remainder = rd.TermHeap(f)
+        result = {}
+        while True:
+            lead = remainder.leading()
+            if lead is None:
+                break
+            key, coef = lead
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                remainder.pop_leading()
+                for nf_key, nf_coef in zip(*cached):
+                    result[nf_key] = (result.get(nf_key, 0) + coef * nf_coef) % p
+                continue
+            lst = self.index.divisors(key)
+            if len(lst) == 0:
+                remainder.pop_leading()
+                result[key] = (result.get(key, 0) + coef) % p
+            else:
+                remainder.cancel_leading(lst[0])
+        return dict([(key, coef) for key, coef in result.items() if coef != 0])
+
+
+    def monomial(self, key):
+        """
+        Get the normal form of a monomial, from the cache or by reducing it and caching the result.
+        @param key: The packed monomial.
+        @return: The normal form as a tuple of descending packed monomials and a tuple of coefficients.
+        """
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        terms = self._reduce_terms(poly.Polynomial.from_packed([1], [key], self.nvar, self.field, self.order))
+        keys = tuple(sorted(terms, reverse = True))
+        cached = (keys, tuple([terms[k] for k in keys]))
+        self.cache[key] = cached
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last = False)
+        return cached
+
+
+    def reduce(self, f):
+        """
+        Compute the normal form of a polynomial.
+        @param f: Polynomial f, with the variables, field and order of the basis.
+        @return: The normal form represented as a polynomial object.
+        """
+
+        assert isinstance(f, poly.Polynomial), 'The input must be a polynomial.'
+        assert f.nvar == self.nvar and f.field == self.field and f.order == self.order, 'The polynomial should match the basis.'
+
+        result = {}
+        p = self.field.p
+        for key, coef in zip(f.keys, f.coefs.tolist()):
+            for nf_key, nf_coef in zip(*self.monomial(key)):
+                result[nf_key] = (result.get(nf_key, 0) + coef * nf_coef) % p
+        keys = sorted([key for key, coef in result.items() if coef != 0], reverse = True)
+        return poly.Polynomial.from_packed([result[key] for key in keys], keys, self.nvar, self.field, self.order)
+
+
+    def contains(self, f):
+        """
+        Check if a polynomial is in the ideal of the basis.
+        @param f: Polynomial f.
+        @return: True if the normal form of f is zero, False if not.
+        """
+
+        return self.reduce(f).is_zero()
+
+
+    def reduce_all(self, F, processes = 1, chunksize = 64):
+        """
+        Compute the normal forms of a batch of polynomials. On a process pool, every worker reduces whole chunks of polynomials with
+        its own copy of the service, caches included, and the cache of the calling process is left unchanged.
+        @param F: Iterable of polynomials.
+        @param processes: The number of worker processes, all cores with None. With 1, the polynomials are reduced in the calling process.
+        @param chunksize: The number of polynomials sent to a worker at a time.
+        @return: List of the normal forms, in the order of F.
+        """
+
+        if processes == 1:
+            return [self.reduce(f) for f in F]
+        F = list(F)
+        jobs = [(self, F[start:start + chunksize]) for start in range(0, len(F), chunksize)]
+        return [r for chunk in pl.imap_jobs(_reduce_chunk, jobs, processes) for r in chunk]
+
+
+    def contains_all(self, F, processes = 1, chunksize = 64):
+        """
+        Check if each polynomial of a batch is in the ideal of the basis.
+        @param F: Iterable of polynomials.
+        @param processes: The number of worker processes, as for reduce_all.
+        @param chunksize: The number of polynomials sent to a worker at a time.
+        @return: List of booleans, in the order of F.
+        """
+
+        return [r.is_zero() for r in self.reduce_all(F, processes, chunksize)]
+
+
+def _reduce_chunk(job):
+    """
+    Compute the normal forms of a chunk of polynomials, in a worker process.
+    @param job: Tuple of the normal form service and the list of polynomials.
+    @return: List of the normal forms.
+    """
+
+    service, F = job
+    return [service.reduce(f) for f in F]
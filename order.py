@@ -0,0 +1,184 @@
+import numpy as np
+from abc import ABC, abstractmethod
+
+
+class MonomialOrder(ABC):
+    """
+    A monomial order given by rows of integer weights: monomials are compared by their weighted degrees, row after row,
+    and ties left by every row are broken by the reverse lexicographic order, the monomial with the smaller exponent
+    on the last variable where they differ being larger.
+    Every weighted degree is a linear function of the exponents, so the packer can store them in front of the exponents
+    and compare packed monomials as integers (see monomial.py).
+    """
+
+    def __init__(self, params = ()):
+        """
+        The constructor.
+        @param params: Tuple of the parameters of the order, used for equality and hashing.
+        """
+
+        self.params = tuple(params)
+
+
+    def __repr__(self):
+        """
+        @return: The order printed in string.
+        """
+
+        return '{}({})'.format(type(self).__name__, ', '.join([repr(x) for x in self.params]))
+
+
+    def __eq__(self, other):
+        """
+        @return: True if both orders are the same, False if not.
+        """
+
+        return type(self) == type(other) and self.params == other.params
+
+
+    def __hash__(self):
+        """
+        @return: The hash of the order.
+        """
+
+        return hash((type(self).__name__, self.params))
+
+
+    @abstractmethod
+    def rows(self, nvar):
+        """
+        Get the weight rows of the order.
+        @param nvar: The number of variables.
+        @return: 2-D integer array of weights, one row per weighted degree, the first row being the most significant.
+        """
+
+
+    def key(self, exponents):
+        """
+        Compute a sort key of a monomial, larger monomials having larger keys. Polynomials use the packed monomials of
+        monomial.py instead, which compare the same way.
+        @param exponents: Array of exponents.
+        @return: The key as a tuple of integers.
+        """
+
+        exponents = np.asarray(exponents, dtype = np.int64)
+        return tuple((self.rows(len(exponents)) @ exponents).tolist()) + tuple((-exponents[::-1]).tolist())
+
+
+class Grevlex(MonomialOrder):
+    """
+    The graded reverse lexicographic order: total degree first, then reverse lexicographic.
+    """
+
+    def rows(self, nvar):
+        """
+        @param nvar: The number of variables.
+        @return: 2-D integer array of weights, one row per weighted degree.
+        """
+
+        return np.ones((1, nvar), dtype = np.int64)
+
+
+class Lex(MonomialOrder):
+    """
+    The lexicographic order with x1 > x2 > ... > xn.
+    """
+
+    def rows(self, nvar):
+        """
+        @param nvar: The number of variables.
+        @return: 2-D integer array of weights, one row per weighted degree.
+        """
+
+        return np.eye(nvar, dtype = np.int64)
+
+
+class WeightedDegree(MonomialOrder):
+    """
+    The weighted reverse lexicographic order: weighted degree first, then reverse lexicographic.
+    """
+
+    def __init__(self, weights):
+        """
+        The constructor.
+        @param weights: Sequence of positive integer weights, one per variable.
+        """
+
+        assert all([isinstance(w, (int, np.integer)) and w > 0 for w in weights]), 'The weights should be positive integers.'
+
+        super().__init__([int(w) for w in weights])
+
+
+    def rows(self, nvar):
+        """
+        @param nvar: The number of variables.
+        @return: 2-D integer array of weights, one row per weighted degree.
+        """
+
+        assert len(self.params) == nvar, 'There should be one weight per variable.'
+
+        return np.array([self.params], dtype = np.int64)
+
+
+class Block(MonomialOrder):
+    """
+    The block (elimination) order: the variables are split into consecutive blocks, compared with grevlex one block after another,
+    so any monomial involving the first block is larger than every monomial in the later blocks only.
+    """
+
+    def __init__(self, sizes):
+        """
+        The constructor.
+        @param sizes: Sequence of positive block sizes, adding up to the number of variables.
+        """
+
+        assert all([isinstance(k, (int, np.integer)) and k > 0 for k in sizes]), 'The block sizes should be positive integers.'
+
+        super().__init__([int(k) for k in sizes])
+
+
+    def rows(self, nvar):
+        """
+        @param nvar: The number of variables.
+        @return: 2-D integer array of weights, one row per weighted degree.
+        """
+
+        assert sum(self.params) == nvar, 'The block sizes should add up to the number of variables.'
+
+        rows = []
+        start = 0
+        for i, size in enumerate(self.params):
+            row = np.zeros(nvar, dtype = np.int64)
+            row[start:start + size] = 1
+            rows.append(row)
+            # The final reverse lexicographic tie-break only reaches the last block, earlier blocks need their own
+            if i < len(self.params) - 1:
+                for j in range(start + size - 1, start - 1, -1):
+                    row = np.zeros(nvar, dtype = np.int64)
+                    row[j] = -1
+                    rows.append(row)
+            start += size
+        return np.array(rows, dtype = np.int64)
+
+
+# The default order
+GREVLEX = Grevlex()
+
+# Orders that only need a name
+ORDERS = {'grevlex': GREVLEX, 'lex': Lex()}
+
+
+def get_order(order):
+    """
+    Get an order object.
+    @param order: An order object, one of the names in ORDERS, or None for grevlex.
+    @return: The order object.
+    """
+
+    if order is None:
+        return GREVLEX
+    if isinstance(order, str):
+        assert order in ORDERS, 'Unknown order {}'.format(order)
+        return ORDERS[order]
+    assert isinstance(order, MonomialOrder), 'The order should be a MonomialOrder.'
+    return order
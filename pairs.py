@@ -0,0 +1,249 @@
+import heapq
+import random
+
+
+def normal_degree(f, g, lcm_degree, sugar):
+    """
+    Normal selection key: the total degree of the lcm of the leading terms.
+    @param f: One polynomial of the pair.
+    @param g: Another polynomial of the pair.
+    @param lcm_degree: The total degree of the lcm of the leading terms of f and g.
+    @param sugar: Dictionary of sugar degrees of the basis elements.
+    @return: The priority of the pair, smaller first.
+    """
+
+    return lcm_degree
+
+
+def sugar_degree(f, g, lcm_degree, sugar):
+    """
+    Sugar selection key: the sugar degree of the S-polynomial of the pair.
+    @param f: One polynomial of the pair.
+    @param g: Another polynomial of the pair.
+    @param lcm_degree: The total degree of the lcm of the leading terms of f and g.
+    @param sugar: Dictionary of sugar degrees of the basis elements.
+    @return: The priority of the pair, smaller first.
+    """
+
+    packer = f.packer
+    return max(sugar[f] - packer.degree(f.lm), sugar[g] - packer.degree(g.lm)) + lcm_degree
+
+
+def first_in(f, g, lcm_degree, sugar):
+    """
+    First-in selection key: all pairs have the same priority, so they are selected in insertion order.
+    @param f: One polynomial of the pair.
+    @param g: Another polynomial of the pair.
+    @param lcm_degree: The total degree of the lcm of the leading terms of f and g.
+    @param sugar: Dictionary of sugar degrees of the basis elements.
+    @return: The priority of the pair, smaller first.
+    """
+
+    return 0
+
+
+KEYS = {'normal': normal_degree, 'sugar': sugar_degree, 'first': first_in}
+
+
+class PairQueue:
+    """
+    The pair queue holds the S-pairs waiting to be reduced in a binary heap. The priority of a pair is computed once
+    when it is inserted, and ties are broken by insertion order. Removed pairs are discarded lazily when they reach the top.
+    """
+
+    def __init__(self, G, key = 'normal', sugar = None):
+        """
+        The constructor.
+        @param G: The basis, a list of polynomials which may grow while the queue is in use.
+        @param key: Selection key, either one of 'normal', 'sugar' and 'first' or a function with the signature of normal_degree.
+        @param sugar: Dictionary of sugar degrees of the basis elements, needed by the sugar key.
+        """
+
+        self.G = G
+        self.key = KEYS[key] if isinstance(key, str) else key
+        self.sugar = sugar
+        self.heap = []
+        self.entries = {}
+        self.counter = 0
+
+
+    def __len__(self):
+        """
+        @return: The number of pairs in the queue.
+        """
+
+        return len(self.entries)
+
+
+    def __iter__(self):
+        """
+        @return: Iterator over the pairs in the queue in insertion order.
+        """
+
+        return iter(list(self.entries))
+
+
+    def __contains__(self, pair):
+        """
+        @param pair: A pair (i, j) of positions in the basis.
+        @return: True if the pair is in the queue, False if not.
+        """
+
+        return pair in self.entries
+
+
+    def push(self, pair):
+        """
+        Insert a pair into the queue, unless it is already there.
+        @param pair: A pair (i, j) of positions in the basis.
+        """
+
+        if pair in self.entries:
+            return
+        f, g = self.G[pair[0]], self.G[pair[1]]
+        packer = f.packer
+        lcm_degree = packer.degree(packer.lcm(f.lm, g.lm))
+        entry = [self.key(f, g, lcm_degree, self.sugar), self.counter, pair]
+        self.counter += 1
+        self.entries[pair] = entry
+        heapq.heappush(self.heap, entry)
+
+
+    def extend(self, pairs):
+        """
+        Insert several pairs into the queue in order.
+        @param pairs: Iterable of pairs.
+        """
+
+        for pair in pairs:
+            self.push(pair)
+
+
+    def remove(self, pair):
+        """
+        Remove a pair from the queue.
+        @param pair: A pair in the queue.
+        """
+
+        entry = self.entries.pop(pair)
+        entry[2] = None
+
+
+    def _discard_removed(self):
+        """
+        Pop removed pairs off the top of the heap.
+        """
+
+        heap = self.heap
+        while len(heap) > 0 and heap[0][2] is None:
+            heapq.heappop(heap)
+
+
+    def peek_priority(self):
+        """
+        Get the priority of the next pair without removing it.
+        @return: The priority, None if the queue is empty.
+        """
+
+        self._discard_removed()
+        return self.heap[0][0] if len(self.heap) > 0 else None
+
+
+    def pop(self):
+        """
+        Remove and return the pair with the smallest priority.
+        @return: The pair.
+        """
+
+        self._discard_removed()
+        assert len(self.heap) > 0, 'The pair queue is empty.'
+        pair = heapq.heappop(self.heap)[2]
+        del self.entries[pair]
+        return pair
+
+
+class RandomPairQueue:
+    """
+    The random pair queue holds the S-pairs in a list and pops a uniformly random one in constant time.
+    Unlike a set of pairs, its state only depends on the sequence of operations, so runs are reproducible from a seed.
+    """
+
+    def __init__(self):
+        """
+        The constructor.
+        """
+
+        self.items = []
+        self.positions = {}
+
+
+    def __len__(self):
+        """
+        @return: The number of pairs in the queue.
+        """
+
+        return len(self.items)
+
+
+    def __iter__(self):
+        """
+        @return: Iterator over the pairs in the queue.
+        """
+
+        return iter(list(self.items))
+
+
+    def __contains__(self, pair):
+        """
+        @param pair: A pair (i, j) of positions in the basis.
+        @return: True if the pair is in the queue, False if not.
+        """
+
+        return pair in self.positions
+
+
+    def push(self, pair):
+        """
+        Insert a pair into the queue, unless it is already there.
+        @param pair: A pair (i, j) of positions in the basis.
+        """
+
+        if pair in self.positions:
+            return
+        self.positions[pair] = len(self.items)
+        self.items.append(pair)
+
+
+    def extend(self, pairs):
+        """
+        Insert several pairs into the queue in order.
+        @param pairs: Iterable of pairs.
+        """
+
+        for pair in pairs:
+            self.push(pair)
+
+
+    def remove(self, pair):
+        """
+        Remove a pair from the queue by moving the last pair into its slot.
+        @param pair: A pair in the queue.
+        """
+
+        position = self.positions.pop(pair)
+        last = self.items.pop()
+        if last != pair:
+            self.items[position] = last
+            self.positions[last] = position
+
+
+    def pop(self):
+        """
+        Remove and return a uniformly random pair, drawn with the random module.
+        @return: The pair.
+        """
+
+        assert len(self.items) > 0, 'The pair queue is empty.'
+        pair = self.items[random.randrange(len(self.items))]
+        self.remove(pair)
+        return pair
@@ -0,0 +1,32 @@
+import itertools
+import multiprocessing
+import os
+
+
+# Number of jobs handed to the process pool at a time, per worker, so that streams of jobs are never materialized
+WINDOW = 256
+
+
+def imap_jobs(function, jobs, processes = None, chunksize = 1):
+    """
+    Apply a function to jobs on a process pool and yield the results in the order of the jobs.
+    Jobs are taken from the iterable a window at a time, so an endless stream of jobs runs in constant memory.
+    @param function: A module-level function taking one job.
+    @param jobs: Iterable of jobs.
+    @param processes: The number of worker processes, all cores by default. With 1, jobs run in the calling process.
+    @param chunksize: The number of jobs sent to a worker at a time.
+    @return: Iterator over the results.
+    """
+
+    if processes == 1:
+        for job in jobs:
+            yield function(job)
+    else:
+        jobs = iter(jobs)
+        size = WINDOW * chunksize * (processes or os.cpu_count() or 1)
+        with multiprocessing.Pool(processes) as pool:
+            window = list(itertools.islice(jobs, size))
+            while len(window) > 0:
+                for result in pool.imap(function, window, chunksize):
+                    yield result
+                window = list(itertools.islice(jobs, size))
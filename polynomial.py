@@ -1,71 +1,277 @@
 import numpy as np
 import finite_field as ff
+import divisor as dv
+import monomial as mono
+import order as od
+import heapq
 import math
+import time
+import weakref
+
+
+# Intern table of polynomials, see intern
+_interned = weakref.WeakValueDictionary()
+
+# Products with more pairs of terms than this are computed with a heap instead of materializing every pair, see multiply_terms.
+# The vectorized outer product is up to three times faster than the heap from 8 x 8 to 256 x 256 terms,
+# so the heap is only there to bound memory: below this size the temporary exponent array takes at most 512 KiB per variable
+PRODUCT_MAX = 1 << 16
+
+# Number of polynomials built and time spent building them, accumulated as [count, seconds] while a profile is active (see instrument.py)
+construction_time = None
 
 
 class Polynomial:
     """
     The polynomial class defines the polynomials to be used in Buchberger's algorithm.
+    Terms are stored as an integer coefficient array alongside packed monomials (see monomial.py),
+    sorted in descending order for the monomial order of the polynomial, grevlex by default.
+    Packed monomials bound the exponents by min(2^14 - 1, 65534 // n) in n variables, 6553 for 10 variables: building a polynomial
+    or a product with a larger exponent raises OverflowError.
+    Polynomials are immutable: arithmetic returns new polynomials, and two polynomials are equal (with equal hashes)
+    when they have the same terms over the same field.
     """
 
-    def __init__(self, monomials):
+    def __init__(self, monomials, field = None, order = None):
         """
-        The constructor. The polynomials will be grouped by terms and sorted in grevlex order.
+        The constructor. The polynomials will be grouped by terms and sorted in the monomial order.
         @param monomials: Array of monomials that make up the polynomial.
         Each monomial is represented as an array of exponents on variables including the coefficient.
+        @param field: The coefficient field as a finite_field.FiniteField, the field of the module-level p by default.
+        @param order: The monomial order as an order.MonomialOrder or one of the names in order.ORDERS, grevlex by default.
         """
 
         assert len(monomials) > 0, 'There should be at least 1 monomials in the polynomial'
         assert len(set([len(x) for x in monomials])) == 1, 'All monomials should have the same number of variables, include 0 if needed'
 
-        # Sort the polynomial and group the terms
-        arr = monomials.copy()
-        mergesort(arr)
-        arr = arr[::-1]
-        arr_ix = 0
-        grouped_monomials = []
-        monomial = np.array([])
-
-        while arr_ix < len(arr) - 1:
-            if compare(arr[arr_ix], arr[arr_ix + 1]) != 0:
-                if len(monomial) == 0:
-                    grouped_monomials.append(arr[arr_ix])
-                    arr_ix += 1
-                else:
-                    grouped_monomials.append(monomial)
-                    arr_ix += 1
-                    monomial = np.array([])
-            else:
-                if len(monomial) == 0:
-                    monomial = np.concatenate([np.array([ff.ff_add(arr[arr_ix][0], arr[arr_ix + 1][0])]), arr[arr_ix][1:]])
-                    arr_ix += 1
-                else:
-                    monomial = np.concatenate([np.array([ff.ff_add(monomial[0] + arr[arr_ix + 1][0])]), arr[arr_ix][1:]])
-                    arr_ix += 1
-        if len(monomial) == 0:
-            grouped_monomials.append(arr[arr_ix])
+        arr = np.asarray(monomials)
+        self._set_terms(arr[:, 0].astype(np.int64), arr[:, 1:].astype(np.int64), field or ff.default_field(), od.get_order(order))
+
+
+    def _set_terms(self, coefs, exps, field, order):
+        """
+        Sort, group and filter terms given as unordered columns, and store them in the polynomial.
+        @param coefs: Array of integer coefficients.
+        @param exps: 2-D array of exponents, one row per term.
+        @param field: The coefficient field.
+        @param order: The monomial order object.
+        """
+
+        start = time.perf_counter() if construction_time is not None else 0.0
+
+        # Sort the terms in descending order with a single lexsort on the keys computed once per term: the weighted degrees
+        # of the order first (descending), then ties broken by the exponents from the last variable to the first (ascending)
+        coefs = np.mod(coefs, field.p)
+        permutation = np.lexsort(mono.get_packer(exps.shape[1], order).sort_keys(exps))
+        coefs, exps = coefs[permutation], exps[permutation]
+
+        # Group equal monomials and add up their coefficients modulo p
+        starts = np.flatnonzero(np.concatenate([[True], (exps[1:] != exps[:-1]).any(axis = 1)]))
+        coefs = np.mod(np.add.reduceat(coefs, starts), field.p)
+        exps = exps[starts]
+
+        # Only keep nonzero monomials, the zero polynomial has no terms
+        nonzero = coefs != 0
+        self._init(field, order, exps.shape[1], coefs[nonzero], exps[nonzero], None, start)
+
+
+    def _init(self, field, order, nvar, coefs, exps, keys, start):
+        """
+        Store the terms of a new polynomial and reset its cached values, shared by all constructors.
+        @param field: The coefficient field.
+        @param order: The monomial order object.
+        @param nvar: The number of variables.
+        @param coefs: Integer array of nonzero coefficients reduced modulo p, in descending order of the terms.
+        @param exps: 2-D integer array of exponents matching coefs, or None if the terms are given by keys.
+        @param keys: Tuple of packed monomials matching coefs, or None if the terms are given by exps.
+        @param start: The time the construction started, counted in construction_time.
+        """
+
+        self.field = field
+        self.order = order
+        self.nvar = nvar
+        self.nterm = len(coefs)
+        self.coefs = coefs
+        self.coefs.flags.writeable = False
+        self._exps = exps
+        if exps is not None:
+            self._exps.flags.writeable = False
+            if self.nterm > 0 and exps.max() > self.packer.exponent_max:
+                raise OverflowError('Exponents above {} do not fit in a packed monomial in {} variables.'
+                                    .format(self.packer.exponent_max, nvar))
+        self._keys = keys
+        self._hash = None
+        self._lt = None
+        self._lead = None
+
+        # The total degree is the largest total degree of any term, which is not always the one of the leading term
+        if self.nterm == 0:
+            self.degree = 0
+        elif exps is not None:
+            self.degree = int(exps.sum(axis = 1).max())
+        elif self.packer.graded:
+            self.degree = self.packer.degree(keys[0])
         else:
-            grouped_monomials.append(monomial)
-
-        # Only keep nonzero monomials
-        grouped_monomials = np.array(grouped_monomials)
-        filtered_monomials = []
-        for monomial in grouped_monomials:
-            if (monomial[0] % ff.p != 0):
-                filtered_monomials.append(np.concatenate([np.array([monomial[0] % ff.p]), monomial[1:]]))
-        grouped_monomials = np.array(filtered_monomials)
-
-        # Check if the resulting polynomial is a zero polynomial
-        if len(grouped_monomials) > 0:
-            self.monomials = grouped_monomials
-            self.nvar = len(grouped_monomials[0]) - 1
-            self.nterm = len(grouped_monomials)
-            self.degree = grouped_monomials[:, 1:].sum(axis = 1).max()
+            self.degree = max([self.packer.degree(key) for key in keys])
+        if construction_time is not None:
+            construction_time[0] += 1
+            construction_time[1] += time.perf_counter() - start
+
+
+    @classmethod
+    def from_terms(cls, coefs, exps, field = None, order = None):
+        """
+        Build a polynomial from unordered columns of coefficients and exponents.
+        @param coefs: Array of integer coefficients.
+        @param exps: 2-D array of exponents, one row per term.
+        @param field: The coefficient field, the field of the module-level p by default.
+        @param order: The monomial order, grevlex by default.
+        @return: The polynomial object.
+        """
+
+        polynomial = cls.__new__(cls)
+        polynomial._set_terms(np.asarray(coefs, dtype = np.int64), np.asarray(exps, dtype = np.int64), field or ff.default_field(),
+                              od.get_order(order))
+        return polynomial
+
+
+    @classmethod
+    def from_packed(cls, coefs, keys, nvar, field = None, order = None):
+        """
+        Build a polynomial directly from packed terms, skipping sorting and grouping.
+        @param coefs: Array of nonzero coefficients reduced modulo p.
+        @param keys: List of distinct packed monomials in descending order, matching coefs.
+        @param nvar: The number of variables.
+        @param field: The coefficient field, the field of the module-level p by default.
+        @param order: The monomial order the keys were packed with, grevlex by default.
+        @return: The polynomial object.
+        """
+
+        start = time.perf_counter() if construction_time is not None else 0.0
+        polynomial = cls.__new__(cls)
+        polynomial._init(field or ff.default_field(), od.get_order(order), nvar, np.array(coefs, dtype = np.int64), None, tuple(keys), start)
+        return polynomial
+
+
+    @classmethod
+    def from_sorted(cls, coefs, exps, field = None, order = None):
+        """
+        Build a polynomial from arrays of distinct nonzero terms already sorted in descending order, sharing the arrays instead of copying them.
+        @param coefs: Integer array of nonzero coefficients reduced modulo p.
+        @param exps: 2-D integer array of exponents, one row per term, matching coefs, of any integer type.
+        @param field: The coefficient field, the field of the module-level p by default.
+        @param order: The monomial order the terms are sorted in, grevlex by default.
+        @return: The polynomial object.
+        """
+
+        assert coefs.dtype == np.int64 and np.issubdtype(exps.dtype, np.integer), 'The arrays should hold integers, the coefficients 64-bit.'
+
+        start = time.perf_counter() if construction_time is not None else 0.0
+        polynomial = cls.__new__(cls)
+        polynomial._init(field or ff.default_field(), od.get_order(order), exps.shape[1], coefs.view(), exps.view(), None, start)
+        return polynomial
+
+
+    @property
+    def packer(self):
+        """
+        The packer for monomials in the variables and the order of the polynomial.
+        """
+
+        return mono.get_packer(self.nvar, self.order)
+
+
+    @property
+    def keys(self):
+        """
+        Tuple of packed monomials of the terms in descending order.
+        Once packed, the polynomial drops its own exponent array, so it never holds both representations.
+        Exponents shared with other objects, such as the views of storage.IdealStore, are kept since they cost nothing.
+        """
+
+        if self._keys is None:
+            self._keys = tuple(self.packer.pack(self._exps)) if self.nterm > 0 else ()
+            if self._exps is not None and self._exps.base is None:
+                self._exps = None
+        return self._keys
+
+
+    @property
+    def exps(self):
+        """
+        2-D array of exponents of the terms, one row per term, unpacked from the keys again at each access once they exist.
+        """
+
+        if self._exps is not None:
+            if self._exps.dtype == np.int64:
+                return self._exps
+            # Narrow exponents, such as the views of storage.IdealStore, are widened so that arithmetic on them cannot wrap around
+            exps = self._exps.astype(np.int64)
         else:
-            self.nvar = len(monomials[0]) - 1
-            self.nterm = 0
-            self.degree = 0
-            self.monomials = np.array([np.zeros(self.nvar + 1)])
+            exps = self.packer.unpack(self._keys) if self.nterm > 0 else np.zeros((0, self.nvar), dtype = np.int64)
+        exps.flags.writeable = False
+        return exps
+
+
+    @property
+    def monomials(self):
+        """
+        Array of monomials in the original layout, each row being the coefficient followed by the exponents.
+        The zero polynomial is a single row of zeros.
+        """
+
+        if self.nterm == 0:
+            return np.zeros((1, self.nvar + 1), dtype = np.int64)
+        return np.column_stack([self.coefs, self.exps])
+
+
+    def __eq__(self, other):
+        """
+        Check if two polynomials have the same terms over the same field.
+        @param other: Another polynomial.
+        @return: True if the polynomials are equal, False if not.
+        """
+
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        if self is other:
+            return True
+        return self.nvar == other.nvar and self.field == other.field and self.order == other.order and self.nterm == other.nterm and \
+            hash(self) == hash(other) and self.keys == other.keys and (self.coefs == other.coefs).all()
+
+
+    def __hash__(self):
+        """
+        Hash the terms of the polynomial, computed once.
+        @return: The hash.
+        """
+
+        if self._hash is None:
+            self._hash = hash((self.field.p, self.order, self.nvar, self.keys, self.coefs.tobytes()))
+        return self._hash
+
+
+    def __getstate__(self):
+        """
+        Pickle the terms without the cached hash, which depends on the hash seed of the process.
+        @return: The state of the polynomial.
+        """
+
+        state = self.__dict__.copy()
+        state['_hash'] = None
+        return state
+
+
+    def __setstate__(self, state):
+        """
+        Restore the state of the polynomial, keeping its arrays read-only.
+        @param state: The state returned by __getstate__.
+        """
+
+        self.__dict__.update(state)
+        for arr in (self.coefs, self._exps):
+            if arr is not None:
+                arr.flags.writeable = False
 
 
     def is_zero(self):
@@ -87,9 +293,10 @@ class Polynomial:
 
         if not self.is_zero():
             result = []
+            exps = self.exps
             for i in range(self.nterm):
-                coef = self.monomials[i][0]
-                exponents = self.monomials[i][1:]
+                coef = self.coefs[i]
+                exponents = exps[i]
                 monomial = [str(coef)]
                 for j, k in zip(np.arange(1, self.nvar + 1), exponents):
                     if k != 0:
@@ -101,14 +308,85 @@ class Polynomial:
             return '0'
 
 
+    def _leading(self):
+        """
+        Compute the packed monomial, coefficient and divisibility mask of the leading term once, unpacking or packing only that term.
+        @return: Tuple of the packed monomial, the coefficient and the mask, None for the zero polynomial.
+        """
+
+        if self._lead is None and self.nterm > 0:
+            if self._keys is not None:
+                lm = self._keys[0]
+                exponents = self.packer.unpack(self._keys[:1])[0]
+            else:
+                exponents = self._exps[0]
+                lm = self.packer.pack(self._exps[:1])[0]
+            self._lead = (lm, int(self.coefs[0]), dv.divmask(exponents.tolist()))
+        return self._lead
+
+
+    @property
+    def lm(self):
+        """
+        The packed leading monomial, None for the zero polynomial.
+        """
+
+        lead = self._lead or self._leading()
+        return lead[0] if lead is not None else None
+
+
+    @property
+    def lc(self):
+        """
+        The leading coefficient as an integer, 0 for the zero polynomial.
+        """
+
+        lead = self._lead or self._leading()
+        return lead[1] if lead is not None else 0
+
+
+    @property
+    def divmask(self):
+        """
+        The divisibility mask of the leading monomial (see divisor.divmask), 0 for the zero polynomial.
+        """
+
+        lead = self._lead or self._leading()
+        return lead[2] if lead is not None else 0
+
+
+    @property
+    def sugar(self):
+        """
+        The sugar degree of the polynomial as a generator, its total degree. The solver tracks the sugar of the polynomials it
+        derives separately, since it depends on their history.
+        """
+
+        return self.degree
+
+
     def lt(self):
         """
-        Get the leading term in the polynomial under the grevlex order.
+        Get the leading term in the polynomial under its monomial order, computed once.
         @return: Leading term represented as a polynomial object.
         """
 
-        leading_term = self.monomials[0]
-        return Polynomial(leading_term.reshape(-1, len(leading_term)))
+        if self._lt is None:
+            self._lt = self if self.nterm <= 1 else Polynomial.from_packed(self.coefs[:1], self.keys[:1], self.nvar, self.field, self.order)
+        return self._lt
+
+
+    def with_order(self, order):
+        """
+        Get the same polynomial under another monomial order.
+        @param order: The monomial order as an order.MonomialOrder or one of the names in order.ORDERS.
+        @return: The polynomial with its terms sorted in the new order.
+        """
+
+        order = od.get_order(order)
+        if order == self.order:
+            return self
+        return Polynomial.from_terms(self.coefs, self.exps, self.field, order)
 
 
     def add(self, poly):
@@ -119,9 +397,11 @@ class Polynomial:
         """
 
         assert isinstance(poly, Polynomial), 'Can only add to a polynomial'
+        assert self.field == poly.field, 'Can only add polynomials over the same field'
+        assert self.order == poly.order, 'Can only add polynomials under the same monomial order'
 
-        poly_sum = np.concatenate([self.monomials, poly.monomials])
-        return Polynomial(poly_sum)
+        keys, coefs = add_terms(self.keys, self.coefs.tolist(), poly.keys, poly.coefs.tolist(), self.field.p)
+        return Polynomial.from_packed(coefs, keys, self.nvar, self.field, self.order)
 
 
     def subtract(self, poly):
@@ -132,8 +412,12 @@ class Polynomial:
         """
 
         assert isinstance(poly, Polynomial), 'Can only subtract a polynomial'
+        assert self.field == poly.field, 'Can only subtract polynomials over the same field'
+        assert self.order == poly.order, 'Can only subtract polynomials under the same monomial order'
 
-        return self.add(poly.scalar_multiply(-1))
+        p = self.field.p
+        keys, coefs = add_terms(self.keys, self.coefs.tolist(), poly.keys, [p - c for c in poly.coefs.tolist()], p)
+        return Polynomial.from_packed(coefs, keys, self.nvar, self.field, self.order)
 
 
     def multiply(self, poly):
@@ -144,15 +428,28 @@ class Polynomial:
         """
 
         assert isinstance(poly, Polynomial), 'Can only multiply with polynomial'
+        assert self.field == poly.field, 'Can only multiply polynomials over the same field'
+        assert self.order == poly.order, 'Can only multiply polynomials under the same monomial order'
 
-        poly_product = []
-        for monomial1 in self.monomials:
-            for monomial2 in poly.monomials:
-                product = np.concatenate([np.array([ff.ff_mul(monomial1[0], monomial2[0])]), monomial1[1:] + monomial2[1:]])
-                poly_product.append(product)
-        poly_product = np.array(poly_product)
+        if self.nterm == 0 or poly.nterm == 0:
+            return Polynomial.from_packed([], [], self.nvar, self.field, self.order)
 
-        return Polynomial(poly_product)
+        # Multiplying by a monomial preserves the order of the terms
+        if self.nterm == 1 or poly.nterm == 1:
+            term, other = (self, poly) if self.nterm == 1 else (poly, self)
+            packer = self.packer
+            key = term.keys[0]
+            coefs = self.field.mul(other.coefs, term.coefs[0])
+            return Polynomial.from_packed(coefs, [packer.multiply(key, k) for k in other.keys], self.nvar, self.field, self.order)
+
+        # Small products are formed at once: an outer product of the coefficient columns and a broadcast sum of the exponents
+        if self.nterm * poly.nterm <= PRODUCT_MAX:
+            coefs = self.field.mul(self.coefs[:, None], poly.coefs[None, :]).ravel()
+            exps = (self.exps[:, None, :] + poly.exps[None, :, :]).reshape(-1, self.nvar)
+            return Polynomial.from_terms(coefs, exps, self.field, self.order)
+
+        keys, coefs = multiply_terms(self.keys, self.coefs.tolist(), poly.keys, poly.coefs.tolist(), self.packer, self.field.p)
+        return Polynomial.from_packed(coefs, keys, self.nvar, self.field, self.order)
 
 
     def scalar_multiply(self, scalar):
@@ -164,13 +461,10 @@ class Polynomial:
 
         assert isinstance(scalar, (int, float)), 'Scalar multiplication only.'
 
-        poly_scalar_prod = []
-        for monomial in self.monomials:
-            product = np.concatenate([np.array([monomial[0] * scalar]), monomial[1:]])
-            poly_scalar_prod.append(product)
-        poly_scalar_prod = np.array(poly_scalar_prod)
-
-        return Polynomial(poly_scalar_prod)
+        if scalar % self.field.p == 0:
+            return Polynomial.from_packed([], [], self.nvar, self.field, self.order)
+        coefs = self.field.mul(self.coefs, int(scalar) % self.field.p)
+        return Polynomial.from_packed(coefs, self.keys, self.nvar, self.field, self.order)
 
 
     def divide(self, monomial):
@@ -185,12 +479,12 @@ class Polynomial:
         assert monomial.nterm == 1, 'This only works for monomials.'
 
         if self.nterm == 0:
-            return Polynomial(np.array([np.zeros(self.nvar + 1)]))
+            return Polynomial.from_packed([], [], self.nvar, self.field, self.order)
 
-        if (self.monomials[0][1:] >= monomial.monomials[0][1:]).all():
-            ratio = np.concatenate([np.array([ff.ff_div(self.monomials[0][0], monomial.monomials[0][0])]),
-            self.monomials[0][1:] - monomial.monomials[0][1:]])
-            return Polynomial(np.array([ratio]))
+        packer = self.packer
+        if packer.divides(monomial.keys[0], self.keys[0]):
+            coef = self.field.div(int(self.coefs[0]), int(monomial.coefs[0]))
+            return Polynomial.from_packed([coef], [packer.quotient(self.keys[0], monomial.keys[0])], self.nvar, self.field, self.order)
         else:
             return False
 
@@ -205,7 +499,106 @@ class Polynomial:
         assert self.nterm == 1, 'This only works for monomials.'
         assert monomial.nterm == 1, 'This only works for monomials.'
 
-        return Polynomial(np.maximum(self.monomials, monomial.monomials))
+        # The coefficient is the larger of the two coefficients, as with an entrywise maximum of the terms
+        coef = max(self.coefs[0], monomial.coefs[0])
+        return Polynomial.from_packed([coef], [self.packer.lcm(self.keys[0], monomial.keys[0])], self.nvar, self.field, self.order)
+
+
+
+
+def intern(polynomial):
+    """
+    Get the shared instance of a polynomial from the intern table, so that equal polynomials share storage.
+    The table holds weak references, entries disappear when no polynomial refers to them anymore.
+    @param polynomial: A polynomial.
+    @return: The first interned polynomial equal to the input, or the input itself.
+    """
+
+    key = (polynomial.field.p, polynomial.order, polynomial.nvar, polynomial.keys, polynomial.coefs.tobytes())
+    shared = _interned.get(key)
+    if shared is None:
+        _interned[key] = polynomial
+        shared = polynomial
+    return shared
+
+
+def add_terms(keys1, coefs1, keys2, coefs2, p):
+    """
+    Add two lists of terms sorted in descending order by merging them, in linear time.
+    @param keys1: List of distinct packed monomials in descending order.
+    @param coefs1: List of integer coefficients in [0, p), matching keys1.
+    @param keys2: Another list of distinct packed monomials in descending order.
+    @param coefs2: List of integer coefficients in [0, p], matching keys2.
+    @param p: The characteristic of the field.
+    @return: The packed monomials and the coefficients of the nonzero terms of the sum, in descending order.
+    """
+
+    keys, coefs = [], []
+    i, j = 0, 0
+    n1, n2 = len(keys1), len(keys2)
+    while i < n1 and j < n2:
+        a, b = keys1[i], keys2[j]
+        if a > b:
+            keys.append(a)
+            coefs.append(coefs1[i])
+            i += 1
+        elif a < b:
+            keys.append(b)
+            coefs.append(coefs2[j] % p)
+            j += 1
+        else:
+            coef = (coefs1[i] + coefs2[j]) % p
+            if coef != 0:
+                keys.append(a)
+                coefs.append(coef)
+            i += 1
+            j += 1
+    keys.extend(keys1[i:])
+    coefs.extend(coefs1[i:])
+    keys.extend(keys2[j:])
+    coefs.extend([c % p for c in coefs2[j:]])
+    return keys, coefs
+
+
+def multiply_terms(keys1, coefs1, keys2, coefs2, packer, p):
+    """
+    Multiply two lists of terms sorted in descending order with Johnson's algorithm. A heap holds, for each term of the shorter factor,
+    its next product with the other factor, so the products come out in descending order and are never all materialized.
+    @param keys1: List of distinct packed monomials in descending order.
+    @param coefs1: List of integer coefficients, matching keys1.
+    @param keys2: Another list of distinct packed monomials in descending order.
+    @param coefs2: List of integer coefficients, matching keys2.
+    @param packer: The packer of the monomials.
+    @param p: The characteristic of the field.
+    @return: The packed monomials and the coefficients of the nonzero terms of the product, in descending order.
+    """
+
+    if len(keys1) > len(keys2):
+        keys1, coefs1, keys2, coefs2 = keys2, coefs2, keys1, coefs1
+    if len(keys1) == 0:
+        return [], []
+
+    multiply = packer.multiply
+    n2 = len(keys2)
+    # Each entry is a negated product key, so the smallest entry popped by heapq is the largest product. Starting every row of
+    # the shorter factor at the first term of keys2 lists the entries in ascending order, already a valid heap
+    heap = [(-multiply(key, keys2[0]), i, 0) for i, key in enumerate(keys1)]
+    keys, coefs = [], []
+    while len(heap) > 0:
+        top = heap[0][0]
+        coef = 0
+        while len(heap) > 0 and heap[0][0] == top:
+            _, i, j = heap[0]
+            coef += coefs1[i] * coefs2[j]
+            if j + 1 < n2:
+                heapq.heapreplace(heap, (-multiply(keys1[i], keys2[j + 1]), i, j + 1))
+            else:
+                heapq.heappop(heap)
+        coef %= p
+        if coef != 0:
+            keys.append(-top)
+            coefs.append(coef)
+    return keys, coefs
 
 
 def compare(monomial1, monomial2):
@@ -239,6 +632,7 @@ def compare(monomial1, monomial2):
 def mergesort(arr):
     """
     A modified mergesort algorithm to sort the monomials of a polynomial in descending grevlex order.
+    The constructor sorts with a vectorized lexsort instead, this is kept as the reference it is tested against (see test_polynomial.py).
     @param arr: Array of monomials that make up the polynomial.
     @return: Sorted array of monomials.
     """
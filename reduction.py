@@ -1,7 +1,9 @@
 import polynomial as poly
 import numpy as np
+import heapq
 import math
 import random
+from functools import lru_cache
 
 
 def reduce(f, g):
@@ -23,30 +25,173 @@ def reduce(f, g):
         return False
 
 
-def reduce_lst(f, G):
+class TermHeap:
+    """
+    The running remainder of a reduction, kept as a priority queue of packed monomials with a coefficient table.
+    Only the terms touched by a reduction step are updated, the remainder is never copied or re-sorted as a whole.
+    """
+
+    def __init__(self, f):
+        """
+        The constructor.
+        @param f: The polynomial to start from.
+        """
+
+        self.nvar = f.nvar
+        self.field = f.field
+        self.order = f.order
+        self.packer = f.packer
+        self.coefs = dict(zip(f.keys, f.coefs.tolist()))
+        # heapq is a min-heap, so the packed monomials are stored negated
+        self.heap = [-key for key in f.keys]
+        heapq.heapify(self.heap)
+
+
+    def leading(self):
+        """
+        Get the leading term of the remainder, discarding cancelled terms on the way.
+        @return: Tuple of the packed monomial and the coefficient of the leading term, None if the remainder is zero.
+        """
+
+        heap, coefs = self.heap, self.coefs
+        while len(heap) > 0:
+            key = -heap[0]
+            if coefs[key] != 0:
+                return key, coefs[key]
+            heapq.heappop(heap)
+            del coefs[key]
+        return None
+
+
+    def cancel_leading(self, g):
+        """
+        Subtract the multiple of g whose leading term equals the leading term of the remainder.
+        @param g: A polynomial whose leading term divides the leading term of the remainder.
+        """
+
+        key, coef = self.leading()
+        heapq.heappop(self.heap)
+        del self.coefs[key]
+
+        g_keys = g.keys
+        ratio_key = self.packer.quotient(key, g_keys[0])
+        ratio_coef = self.field.div(coef, g.lc)
+        heap, coefs, multiply, p = self.heap, self.coefs, self.packer.multiply, self.field.p
+        for g_key, g_coef in zip(g_keys[1:], g.coefs[1:].tolist()):
+            term_key = multiply(ratio_key, g_key)
+            term_coef = -ratio_coef * g_coef
+            if term_key in coefs:
+                coefs[term_key] = (coefs[term_key] + term_coef) % p
+            else:
+                coefs[term_key] = term_coef % p
+                heapq.heappush(heap, -term_key)
+
+
+    def pop_leading(self):
+        """
+        Remove the leading term of the remainder.
+        @return: Tuple of the packed monomial and the coefficient of the removed term.
+        """
+
+        key, coef = self.leading()
+        heapq.heappop(self.heap)
+        del self.coefs[key]
+        return key, coef
+
+
+    def to_polynomial(self):
+        """
+        Convert the remainder back to a polynomial.
+        @return: The remainder represented as a polynomial object.
+        """
+
+        keys = sorted([key for key, coef in self.coefs.items() if coef != 0], reverse = True)
+        return poly.Polynomial.from_packed([self.coefs[key] for key in keys], keys, self.nvar, self.field, self.order)
+
+
+def zero_reduction_steps(G):
+    """
+    Count the reduction steps of the zero polynomial. Every leading term divides it, and the original algorithm took one step
+    with a randomly chosen reducer. The random draw is still made, and its result discarded, so that the random state, and so
+    every later choice of the run, stays the same as with the original algorithm: it is not dead code.
+    @param G: list of polynomials G.
+    @return: 1 if G is nonempty, 0 if not.
+    """
+
+    if len(G) == 0:
+        return 0
+    random.choice(G)
+    return 1
+
+
+def reduce_lst(f, G, index = None):
     """
     Compute the complete reduction of polynomial f with respect to a set of polynomials G. At each step, randomly choose a polynomial
     g in G such that the leading term of g divides the leading term of r.
     @param f: Polynomial f.
     @param G: list of polynomials G.
+    @param index: Optional divisor index over the leading terms of G, holding the elements of G in the same order.
     @return: The result of complete reduction represented as a polynomial object.
     """
 
     assert isinstance(f, poly.Polynomial), 'The input must be a polynomial.'
     assert all([isinstance(g, poly.Polynomial) for g in G]), 'The input must be a list of polynomials.'
 
+    if f.is_zero():
+        return f, zero_reduction_steps(G)
+
     num_add = 0
-    r = f
-    lst = [g for g in G if (r.lt()).divide(g.lt())]
-    while len(lst) > 0:
+    r = TermHeap(f)
+    divides = f.packer.divides
+    leading = r.leading()
+    while leading is not None:
+        if index is not None:
+            lst = index.divisors(leading[0])
+        else:
+            lst = [g for g in G if divides(g.keys[0], leading[0])]
+        if len(lst) == 0:
+            break
         random_g = random.choice(lst)
-        r = reduce(r, random_g)
+        r.cancel_leading(random_g)
         num_add += 1
-        if not r.is_zero():
-            lst = [g for g in G if (r.lt()).divide(g.lt())]
+        leading = r.leading()
+    return r.to_polynomial(), num_add
+
+
+def reduce_full(f, G, index = None):
+    """
+    Compute the fully reduced normal form of polynomial f with respect to a list of polynomials G, reducing every term and not
+    only the leading one. At each step the first polynomial g in G whose leading term divides the current term is used,
+    so the result does not depend on the random state.
+    @param f: Polynomial f.
+    @param G: list of polynomials G.
+    @param index: Optional divisor index over the leading terms of G, holding the elements of G in the same order.
+    @return: The normal form represented as a polynomial object, and the number of reduction steps.
+    """
+
+    assert isinstance(f, poly.Polynomial), 'The input must be a polynomial.'
+    assert all([isinstance(g, poly.Polynomial) for g in G]), 'The input must be a list of polynomials.'
+
+    num_add = 0
+    r = TermHeap(f)
+    divides = f.packer.divides
+    keys, coefs = [], []
+    leading = r.leading()
+    while leading is not None:
+        if index is not None:
+            lst = index.divisors(leading[0])
+        else:
+            lst = [g for g in G if divides(g.keys[0], leading[0])]
+        if len(lst) > 0:
+            r.cancel_leading(lst[0])
+            num_add += 1
         else:
-            lst = []
-    return r, num_add
+            # Terms leave the heap in descending order, so the normal form is built already sorted
+            key, coef = r.pop_leading()
+            keys.append(key)
+            coefs.append(coef)
+        leading = r.leading()
+    return poly.Polynomial.from_packed(coefs, keys, f.nvar, f.field, f.order), num_add
 
 
 def S(f, g):
@@ -60,6 +205,18 @@ def S(f, g):
     assert isinstance(f, poly.Polynomial), 'The input must be a polynomial.'
     assert isinstance(g, poly.Polynomial), 'The input must be a polynomial.'
 
+    return _S(f, g)
+
+
+@lru_cache(maxsize = 4096)
+def _S(f, g):
+    """
+    Compute the S polynomial of polynomials f and g, memoized on the terms of f and g since polynomials are immutable.
+    @param f: Polynomial f.
+    @param g: Polynomial g.
+    @return: The S polynomial represented as a polynomial object.
+    """
+
     lt_f = f.lt()
     lt_g = g.lt()
     lcm_fg = lt_f.lcm(lt_g)
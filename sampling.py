@@ -0,0 +1,110 @@
+import math
+import random
+from functools import lru_cache
+
+
+@lru_cache(maxsize = 4096)
+def num_monomials(n, d):
+    """
+    Count the monomials in n variables of degree d, by stars and bars.
+    @param n: The number of variables.
+    @param d: The degree of the monomials.
+    @return: The number of monomials.
+    """
+
+    if d < 0:
+        return 0
+    return math.comb(d + n - 1, n - 1)
+
+
+def num_monomials_up_to(n, d):
+    """
+    Count the monomials in n variables of degree 1 up to d.
+    @param n: The number of variables.
+    @param d: The maximum degree of the monomials.
+    @return: The number of monomials.
+    """
+
+    return num_monomials(n + 1, d) - 1
+
+
+def unrank_monomial(n, d, rank):
+    """
+    Get the monomial at a given position in the enumeration of buchberger.all_monomials(n, d), without enumerating.
+    @param n: The number of variables.
+    @param d: The degree of the monomial.
+    @param rank: The position, from 0 to num_monomials(n, d) - 1.
+    @return: The monomial as a tuple of exponents.
+    """
+
+    assert 0 <= rank < num_monomials(n, d), 'The rank is out of range.'
+
+    exponents = []
+    for i in range(n - 1):
+        # all_monomials lists the exponent of the current variable in increasing order,
+        # and each value is followed by all monomials of the remaining degree in the remaining variables
+        value = 0
+        while rank >= num_monomials(n - i - 1, d - value):
+            rank -= num_monomials(n - i - 1, d - value)
+            value += 1
+        exponents.append(value)
+        d -= value
+    exponents.append(d)
+    return tuple(exponents)
+
+
+def unrank_monomial_up_to(n, d, rank):
+    """
+    Get the monomial at a given position in the enumeration of buchberger.all_monomials_up_to(n, d), without enumerating.
+    @param n: The number of variables.
+    @param d: The maximum degree of the monomial.
+    @param rank: The position, from 0 to num_monomials_up_to(n, d) - 1.
+    @return: The monomial as a tuple of exponents.
+    """
+
+    assert 0 <= rank < num_monomials_up_to(n, d), 'The rank is out of range.'
+
+    # all_monomials_up_to lists the monomials of degree 1 first, then degree 2, and so on
+    degree = 1
+    while rank >= num_monomials(n, degree):
+        rank -= num_monomials(n, degree)
+        degree += 1
+    return unrank_monomial(n, degree, rank)
+
+
+def sample_monomials(n, d, k):
+    """
+    Sample k distinct monomials in n variables of degree d uniformly at random.
+    Draws the same random numbers as random.sample(list(all_monomials(n, d)), k).
+    @param n: The number of variables.
+    @param d: The degree of the monomials.
+    @param k: The number of monomials.
+    @return: List of monomials as tuples of exponents.
+    """
+
+    return [unrank_monomial(n, d, rank) for rank in random.sample(range(num_monomials(n, d)), k)]
+
+
+def sample_monomials_up_to(n, d, k):
+    """
+    Sample k distinct monomials in n variables of degree 1 up to d uniformly at random.
+    Draws the same random numbers as random.sample(list(all_monomials_up_to(n, d)), k).
+    @param n: The number of variables.
+    @param d: The maximum degree of the monomials.
+    @param k: The number of monomials.
+    @return: List of monomials as tuples of exponents.
+    """
+
+    return [unrank_monomial_up_to(n, d, rank) for rank in random.sample(range(num_monomials_up_to(n, d)), k)]
+
+
+def choice_monomial(n, d):
+    """
+    Choose one monomial in n variables of degree d uniformly at random.
+    Draws the same random numbers as random.choice(list(all_monomials(n, d))).
+    @param n: The number of variables.
+    @param d: The degree of the monomial.
+    @return: The monomial as a tuple of exponents.
+    """
+
+    return unrank_monomial(n, d, random.randrange(num_monomials(n, d)))
@@ -0,0 +1,123 @@
+import polynomial as poly
+import reduction as rd
+import divisor as dv
+import basis as bs
+import heapq
+
+
+def regular_reduce(f, signature, G, signatures, index):
+    """
+    Top reduce a polynomial of a given signature with the reductions that keep the signature, those by a multiple u*g of a
+    basis element g with u*sig(g) smaller than the signature. The first such basis element is used at each step.
+    @param f: The polynomial.
+    @param signature: The signature of f, a tuple (i, t) of the generator position and a packed monomial, compared position over term.
+    @param G: The basis, a list of polynomials.
+    @param signatures: The signatures of the elements of G.
+    @param index: Divisor index over the leading terms of G, holding the elements of G in the same order.
+    @return: The reduced polynomial, the number of reduction steps, and whether it is singular, that is its leading term is
+    the leading term of u*g for a basis element g with u*sig(g) equal to the signature.
+    """
+
+    num_add = 0
+    r = rd.TermHeap(f)
+    packer = f.packer
+    leading = r.leading()
+    while leading is not None:
+        reducer = None
+        singular = False
+        for k in index.divisor_positions(leading[0]):
+            u = packer.quotient(leading[0], G[k].keys[0])
+            multiple = (signatures[k][0], packer.multiply(u, signatures[k][1]))
+            if multiple < signature:
+                reducer = G[k]
+                break
+            singular = singular or multiple == signature
+        if reducer is None:
+            return r.to_polynomial(), num_add, singular
+        r.cancel_leading(reducer)
+        num_add += 1
+        leading = r.leading()
+    return r.to_polynomial(), num_add, False
+
+
+def buchberger_signature(F, stats = None):
+    """
+    A signature-based variant of Buchberger's algorithm in the style of F5 and GVW. Every basis element carries the signature of
+    its representation in terms of the generators, and pairs are processed in increasing signature order, position over term.
+    Only one pair is reduced per signature, and signatures divisible by the signature of a known syzygy, the leading terms of
+    the basis of the previous generators and the signatures of zero reductions, are discarded before reducing.
+    The number of additions counts the reduction steps, the first step of a pair being the subtraction that forms its S-polynomial.
+    @param F: a list of polynomials.
+    @param stats: Optional dictionary, filled with the numbers of signatures reduced under 'num_pairs', of zero reductions under 'num_zero'
+    and of pairs discarded by the syzygy and rewritten criteria or as singular under 'num_pruned'.
+    @return: The Gröbner basis of the ideal generated by F represented as a list of polynomials.
+    """
+
+    assert all([isinstance(f, poly.Polynomial) for f in F]), 'The input must be a list of polynomials.'
+
+    F = [f for f in bs.remove_duplicate(F) if not f.is_zero()]
+    packer = F[0].packer
+    one = packer.pack_one([0] * F[0].nvar)
+    G = []
+    signatures = []
+    index = dv.DivisorIndex(F[0].nvar, order = F[0].order)
+    # Leading monomials of known syzygies, for the generator being processed
+    syzygies = []
+    current = -1
+    heap = [(i, one) for i in range(len(F))]
+    num_add = 0
+    num_pairs = 0
+    num_zero = 0
+    num_pruned = 0
+
+    while len(heap) > 0:
+        signature = heapq.heappop(heap)
+        # Pairs with the same signature are redundant, only one is reduced
+        while len(heap) > 0 and heap[0] == signature:
+            heapq.heappop(heap)
+            num_pruned += 1
+        position, t = signature
+        if position != current:
+            # The basis of the previous generators is complete, its leading terms are the principal syzygies
+            current = position
+            syzygies = [g.keys[0] for g in G]
+        if any([packer.divides(s, t) for s in syzygies]):
+            num_pruned += 1
+            continue
+
+        # Rewritten criterion: the last basis element whose signature divides the signature stands for it
+        f = F[position]
+        for k in range(len(G) - 1, -1, -1):
+            if signatures[k][0] == position and packer.divides(signatures[k][1], t):
+                multiplier = poly.Polynomial.from_packed([1], [packer.quotient(t, signatures[k][1])], F[0].nvar, F[0].field, F[0].order)
+                f = G[k].multiply(multiplier)
+                break
+        num_pairs += 1
+
+        r, new_add, singular = regular_reduce(f, signature, G, signatures, index)
+        num_add += new_add
+        if r.is_zero():
+            num_zero += 1
+            syzygies.append(t)
+            continue
+        if singular:
+            num_pruned += 1
+            continue
+
+        # New pairs, their signature is the larger one of the two multiples
+        lt_r = r.keys[0]
+        for k, g in enumerate(G):
+            lcm = packer.lcm(lt_r, g.keys[0])
+            signature_r = (position, packer.multiply(packer.quotient(lcm, lt_r), t))
+            signature_g = (signatures[k][0], packer.multiply(packer.quotient(lcm, g.keys[0]), signatures[k][1]))
+            if signature_r != signature_g:
+                heapq.heappush(heap, max(signature_r, signature_g))
+        G.append(r)
+        signatures.append(signature)
+        index.add(r)
+
+    if stats is not None:
+        stats['num_pairs'] = num_pairs
+        stats['num_zero'] = num_zero
+        stats['num_pruned'] = num_pruned
+    return G, num_add
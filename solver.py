@@ -0,0 +1,266 @@
+import polynomial as poly
+import reduction as rd
+import binomial as bn
+import divisor as dv
+import pairs as pq
+import basis as bs
+import pickle
+import time
+import os
+
+
+class Solver:
+    """
+    The solver holds the state of a run of Buchberger's algorithm: the current basis, the pair queue, the divisor index
+    and the counters. The run can be stopped and resumed at any time, new generators can be added to an ideal that
+    is already solved, in which case only the S-pairs involving them are processed, and the state can be saved to disk.
+    When every generator is a binomial, so are all S-polynomials and remainders, and the binomial fast path is used.
+    An optional listener is called with the events of the run (see instrument.py). Without one, no event is built.
+    A run can be bounded by a degree cap, budgets of pairs and additions and a time limit, and then leaves a partial basis whose
+    status tells which bound stopped it.
+    Exponents are bounded as for packed monomials (see polynomial.Polynomial), and a run whose S-polynomials or remainders go above
+    the bound stops with OverflowError. A degree cap keeps the exponents below it.
+    """
+
+    def __init__(self, F, selection = 'normal', criteria = True, reduced = False, listener = None):
+        """
+        The constructor.
+        @param F: A nonempty list of nonzero polynomials, the generators.
+        @param selection: 'random' to select a uniformly random pair, 'first' to select pairs in the order they were formed,
+        'normal' to select the pair with the smallest lcm degree, 'sugar' to select the pair with the smallest sugar degree.
+        @param criteria: Whether to skip S-pairs eliminated by the coprime and chain criteria, which are known to reduce to zero.
+        @param reduced: Whether the basis is the reduced Gröbner basis. Elements made redundant by a new leading term are then also
+        dropped from the reducers during the run.
+        @param listener: Optional function called with the name and the data of each event, as listed in instrument.EVENTS.
+        """
+
+        assert len(F) > 0, 'There should be at least 1 generator.'
+        assert all([isinstance(f, poly.Polynomial) for f in F]), 'The input must be a list of polynomials.'
+        assert selection in ('random', 'first', 'normal', 'sugar'), 'Unknown selection {}'.format(selection)
+
+        self.selection = selection
+        self.criteria = criteria
+        self.reduced = reduced
+        self.listener = listener
+        self.binomial = all([bn.is_binomial(f) for f in F])
+        self.G = bs.remove_duplicate(F)
+        self.index = dv.DivisorIndex(F[0].nvar, self.G, F[0].order)
+        self.active = None
+        if reduced:
+            self.active = set(range(len(self.G)))
+            # Drop the generators made redundant by other generators before the run starts
+            G, packer = self.G, F[0].packer
+            for i in range(len(G)):
+                if any([packer.divides(G[j].keys[0], G[i].keys[0]) and (G[j].keys[0] != G[i].keys[0] or j < i) for j in self.active if j != i]):
+                    self.active.remove(i)
+                    self.index.remove(G[i])
+        self.sugar = dict([(f, f.sugar) for f in self.G])
+        if selection == 'random':
+            self.P = pq.RandomPairQueue()
+        else:
+            self.P = pq.PairQueue(self.G, selection, self.sugar)
+        initial, self.num_pruned = bs.initial_pairs(self.G, criteria)
+        self.P.extend(initial)
+        self.num_add = 0
+        self.num_pairs = 0
+        self.num_zero = 0
+        # Pairs whose lcm is above the degree cap of a truncated run, queued again by the next run
+        self.truncated = []
+        self.status = 'pending'
+        if listener is not None and self.num_pruned > 0:
+            listener('pairs_pruned', {'count': self.num_pruned})
+
+
+    def __getstate__(self):
+        """
+        Pickle the solver without its listener, which belongs to the running process.
+        @return: The state of the solver.
+        """
+
+        state = self.__dict__.copy()
+        state['listener'] = None
+        return state
+
+
+    def __len__(self):
+        """
+        @return: The number of S-pairs waiting to be reduced.
+        """
+
+        return len(self.P)
+
+
+    def done(self):
+        """
+        Check if the basis is a Gröbner basis of the ideal generated by all generators added so far.
+        @return: True if no S-pair is left, False if not.
+        """
+
+        return len(self.P) == 0 and len(self.truncated) == 0
+
+
+    def add_generators(self, F):
+        """
+        Extend the ideal with new generators. They join the basis as they are, and only their S-pairs with the basis are queued.
+        @param F: A list of polynomials. Zero polynomials and polynomials already in the basis are ignored.
+        """
+
+        assert all([isinstance(f, poly.Polynomial) for f in F]), 'The input must be a list of polynomials.'
+
+        seen = set(self.G)
+        for f in bs.remove_duplicate(F):
+            if f.is_zero() or f in seen:
+                continue
+            assert f.nvar == self.index.nvar, 'All polynomials should have the same number of variables.'
+            self.binomial = self.binomial and bn.is_binomial(f)
+            self.sugar[f] = f.sugar
+            self._add(f)
+
+
+    def _add(self, r):
+        """
+        Add a nonzero polynomial to the basis and queue its pairs.
+        @param r: The polynomial.
+        """
+
+        start = time.perf_counter()
+        num_pruned = bs.add_to_basis(self.G, self.P, r, self.index, self.criteria, self.active)
+        self.num_pruned += num_pruned
+        if self.listener is not None:
+            self.listener('basis_grown', {'position': len(self.G) - 1, 'nterm': r.nterm, 'degree': r.degree, 'size': len(self.G),
+                                          'time': time.perf_counter() - start})
+            if num_pruned > 0:
+                self.listener('pairs_pruned', {'count': num_pruned})
+
+
+    def step(self, max_degree = None):
+        """
+        Reduce the next S-pair and add its remainder to the basis if it is nonzero.
+        @param max_degree: Optional degree cap. A pair whose lcm has a larger degree is set aside without being reduced.
+        @return: The remainder, None if the pair was set aside.
+        """
+
+        G, listener = self.G, self.listener
+        start = time.perf_counter()
+        i, j = self.P.pop()
+        f, g = G[i], G[j]
+        packer = f.packer
+        lcm_degree = packer.degree(packer.lcm(f.lm, g.lm))
+        if max_degree is not None and lcm_degree > max_degree:
+            self.truncated.append((i, j))
+            return None
+        if listener is not None:
+            listener('pair_selected', {'pair': (i, j), 'degree': lcm_degree, 'time': time.perf_counter() - start})
+
+        ops = bn if self.binomial else rd
+        start = time.perf_counter()
+        s = ops.S(f, g)
+        if listener is not None:
+            listener('reduction_started', {'pair': (i, j), 'nterm': s.nterm, 'degree': s.degree, 'time': time.perf_counter() - start})
+        start = time.perf_counter()
+        r, new_add = ops.reduce_lst(s, G, self.index)
+        if listener is not None:
+            listener('reduction_finished', {'pair': (i, j), 'nterm': r.nterm, 'degree': r.degree, 'num_add': new_add + 1,
+                                            'time': time.perf_counter() - start})
+
+        self.num_add += new_add + 1
+        self.num_pairs += 1
+        if r.is_zero():
+            self.num_zero += 1
+            if listener is not None:
+                listener('zero_reduction', {'pair': (i, j)})
+        else:
+            # The sugar of the remainder is the sugar of the S-polynomial it comes from, or its degree if larger
+            self.sugar[r] = max(pq.sugar_degree(f, g, lcm_degree, self.sugar), r.sugar)
+            self._add(r)
+        return r
+
+
+    def run(self, max_degree = None, max_pairs = None, max_add = None, time_limit = None):
+        """
+        Reduce S-pairs until none is left or a bound is reached, and record why the run stopped in the status:
+        'complete' when the basis is a Gröbner basis, 'max_degree' when it is only the Gröbner basis truncated at the degree cap
+        (every S-pair whose lcm has degree at most the cap reduces to zero), 'max_pairs', 'max_add' or 'time_limit' when a budget ran out.
+        The budgets are checked between pairs, so the last pair may exceed them. A stopped run resumes with another call to run.
+        @param max_degree: Optional degree cap. Pairs whose lcm has a larger degree are kept aside for later runs.
+        @param max_pairs: Optional budget of S-pairs reduced since the solver was created.
+        @param max_add: Optional budget of additions since the solver was created.
+        @param time_limit: Optional budget of wall-clock seconds for this run.
+        @return: The basis, a Gröbner basis if the status is 'complete', and the total number of additions since the solver was created.
+        """
+
+        # Pairs set aside by a previous truncated run get another chance under the new cap
+        self.P.extend(self.truncated)
+        self.truncated = []
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self.status = 'complete'
+        while len(self.P) > 0:
+            if max_pairs is not None and self.num_pairs >= max_pairs:
+                self.status = 'max_pairs'
+                break
+            if max_add is not None and self.num_add >= max_add:
+                self.status = 'max_add'
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                self.status = 'time_limit'
+                break
+            self.step(max_degree)
+        if self.status == 'complete' and len(self.truncated) > 0:
+            self.status = 'max_degree'
+        return self.basis(), self.num_add
+
+
+    def basis(self):
+        """
+        Get the current basis. It is a Gröbner basis once the solver is done.
+        @return: The basis represented as a list of polynomials, the reduced basis if the solver was created with reduced.
+        """
+
+        if self.reduced:
+            return bs.reduced_basis([self.G[i] for i in sorted(self.active)])
+        return list(self.G)
+
+
+    def stats(self, stats = None):
+        """
+        Report the counters of the run.
+        @param stats: Optional dictionary to fill, a new one by default.
+        @return: The dictionary, with the numbers of S-pairs reduced under 'num_pairs', of zero reductions under 'num_zero',
+        of pruned pairs under 'num_pruned' and of pairs left, queued or above the degree cap, under 'num_left',
+        and the status of the last run (see run) under 'status'.
+        """
+
+        stats = {} if stats is None else stats
+        stats['num_pairs'] = self.num_pairs
+        stats['num_zero'] = self.num_zero
+        stats['num_pruned'] = self.num_pruned
+        stats['num_left'] = len(self.P) + len(self.truncated)
+        stats['status'] = self.status
+        return stats
+
+
+    def save(self, path):
+        """
+        Checkpoint the state of the solver to a file. The file is replaced atomically, so an interrupted save keeps the previous checkpoint.
+        The state of the random module, used by random selection and reduction, is not part of the checkpoint.
+        @param path: The file path.
+        """
+
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as file:
+            pickle.dump(self, file, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+
+    @classmethod
+    def load(cls, path):
+        """
+        Restore a solver from a checkpoint written by save.
+        @param path: The file path.
+        @return: The solver object.
+        """
+
+        with open(path, 'rb') as file:
+            solver = pickle.load(file)
+        assert isinstance(solver, cls), '{} is not a solver checkpoint'.format(path)
+        return solver
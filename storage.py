@@ -0,0 +1,154 @@
+import polynomial as poly
+import monomial as mono
+import finite_field as ff
+import order as od
+import numpy as np
+import pickle
+import os
+
+
+class IdealStore:
+    """
+    The ideal store keeps a sequence of ideals (lists of polynomials, such as the bases returned by buchberger_*) in columnar form:
+    the terms of all polynomials in one exponent matrix and one coefficient array, with offset arrays like CSR matrices.
+    Polynomial i has terms term_offsets[i] to term_offsets[i + 1], ideal k has polynomials ideal_offsets[k] to ideal_offsets[k + 1].
+    Polynomials are handed out as views sharing the arrays, and the arrays can be saved and memory-mapped back.
+    Exponents never exceed monomial.EXPONENT_MAX, so they are stored in 16 bits, a quarter of the 64-bit arrays of the polynomials.
+    """
+
+    def __init__(self, exps, coefs, term_offsets, ideal_offsets, field = None, order = None):
+        """
+        The constructor.
+        @param exps: 2-D integer array of exponents of all terms, one row per term.
+        @param coefs: Integer array of coefficients of all terms.
+        @param term_offsets: Integer array of the first term of each polynomial, followed by the number of terms.
+        @param ideal_offsets: Integer array of the first polynomial of each ideal, followed by the number of polynomials.
+        @param field: The coefficient field, the field of the module-level p by default.
+        @param order: The monomial order of the polynomials, grevlex by default.
+        """
+
+        assert exps.ndim == 2 and len(exps) == len(coefs), 'There should be one row of exponents per coefficient.'
+        assert term_offsets[-1] == len(coefs) and ideal_offsets[-1] == len(term_offsets) - 1, 'The offsets do not match the arrays.'
+
+        self.exps = exps
+        self.coefs = coefs
+        self.term_offsets = term_offsets
+        self.ideal_offsets = ideal_offsets
+        self.nvar = exps.shape[1]
+        self.field = field or ff.default_field()
+        self.order = od.get_order(order)
+
+
+    @classmethod
+    def from_ideals(cls, ideals, nvar = None, field = None, order = None):
+        """
+        Build a store from ideals.
+        @param ideals: Iterable of lists of polynomials, all with the same number of variables, field and order.
+        @param nvar: The number of variables, needed only if there is no polynomial.
+        @param field: The coefficient field, taken from the polynomials by default.
+        @param order: The monomial order, taken from the polynomials by default.
+        @return: The store.
+        """
+
+        exps, coefs = [], []
+        term_offsets, ideal_offsets = [0], [0]
+        for G in ideals:
+            for g in G:
+                if nvar is None:
+                    nvar, field, order = g.nvar, g.field, g.order
+                assert g.nvar == nvar and g.field == field and g.order == order, 'All polynomials should have the same variables, field and order.'
+                exps.append(g.exps)
+                coefs.append(g.coefs)
+                term_offsets.append(term_offsets[-1] + g.nterm)
+            ideal_offsets.append(len(term_offsets) - 1)
+
+        assert nvar is not None, 'The number of variables is needed for a store without polynomials.'
+        exps = np.concatenate(exps) if len(exps) > 0 else np.zeros((0, nvar), dtype = np.int64)
+        coefs = np.concatenate(coefs) if len(coefs) > 0 else np.zeros(0, dtype = np.int64)
+        assert len(exps) == 0 or exps.max() <= mono.EXPONENT_MAX, 'The exponents should not exceed monomial.EXPONENT_MAX.'
+        return cls(exps.astype(np.uint16), coefs.astype(np.int64), np.array(term_offsets, dtype = np.int64),
+                   np.array(ideal_offsets, dtype = np.int64), field, order)
+
+
+    def __len__(self):
+        """
+        @return: The number of ideals.
+        """
+
+        return len(self.ideal_offsets) - 1
+
+
+    def num_polynomials(self):
+        """
+        @return: The total number of polynomials.
+        """
+
+        return len(self.term_offsets) - 1
+
+
+    def nbytes(self):
+        """
+        @return: The number of bytes of the arrays.
+        """
+
+        return self.exps.nbytes + self.coefs.nbytes + self.term_offsets.nbytes + self.ideal_offsets.nbytes
+
+
+    def polynomial(self, i):
+        """
+        Get a polynomial as a view on the arrays, without copying its terms.
+        @param i: The position of the polynomial among all polynomials.
+        @return: The polynomial object.
+        """
+
+        start, end = int(self.term_offsets[i]), int(self.term_offsets[i + 1])
+        return poly.Polynomial.from_sorted(self.coefs[start:end], self.exps[start:end], self.field, self.order)
+
+
+    def __getitem__(self, k):
+        """
+        Get an ideal as views on the arrays.
+        @param k: The position of the ideal.
+        @return: The ideal as a list of polynomials.
+        """
+
+        k = range(len(self))[k]
+        return [self.polynomial(i) for i in range(int(self.ideal_offsets[k]), int(self.ideal_offsets[k + 1]))]
+
+
+    def __iter__(self):
+        """
+        @return: Iterator over the ideals, each as a list of polynomials.
+        """
+
+        for k in range(len(self)):
+            yield self[k]
+
+
+    def save(self, path):
+        """
+        Save the store to a directory, one .npy file per array, so it can be memory-mapped by load.
+        @param path: The directory, created if needed.
+        """
+
+        os.makedirs(path, exist_ok = True)
+        for name in ('exps', 'coefs', 'term_offsets', 'ideal_offsets'):
+            np.save(os.path.join(path, name + '.npy'), getattr(self, name))
+        with open(os.path.join(path, 'meta.pkl'), 'wb') as file:
+            pickle.dump({'p': self.field.p, 'order': self.order}, file)
+
+
+    @classmethod
+    def load(cls, path, mmap = True):
+        """
+        Load a store saved by save.
+        @param path: The directory.
+        @param mmap: Whether to memory-map the arrays read-only instead of reading them into memory.
+        @return: The store.
+        """
+
+        with open(os.path.join(path, 'meta.pkl'), 'rb') as file:
+            meta = pickle.load(file)
+        mode = 'r' if mmap else None
+        arrays = [np.load(os.path.join(path, name + '.npy'), mmap_mode = mode) for name in ('exps', 'coefs', 'term_offsets', 'ideal_offsets')]
+        return cls(*arrays, ff.get_field(meta['p']), meta['order'])
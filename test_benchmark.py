@@ -0,0 +1,78 @@
+import benchmark as bm
+import buchberger as buch
+import numpy as np
+import itertools
+import os
+import random
+import pytest
+
+
+def test_suite_resumes_in_batches(tmp_path):
+    path = str(tmp_path)
+    bm.run_suite(path, [3], [4], [3], ['uniform'], 4, strategies = bm.CLASSIC, processes = 1, batch = 3)
+    assert len(os.listdir(path)) == 2
+    first = bm.load_suite(path)
+    assert len(first['n']) == 4 * len(bm.CLASSIC)
+
+    # A larger N only measures the missing ideals, the measured ones are kept as they are
+    bm.run_suite(path, [3], [4], [3], ['uniform'], 7, strategies = bm.CLASSIC, processes = 1, batch = 3)
+    results = bm.load_suite(path)
+    assert sorted(set(results['ideal'].tolist())) == list(range(7))
+    assert (results['num_add'][:len(first['n'])] == first['num_add']).all()
+
+
+@pytest.mark.parametrize('settings', [{'strategies': ('degree', )}, {'seed': 1}, {'limits': {'max_add': 5}}])
+def test_suite_refuses_other_settings(tmp_path, settings):
+    path = str(tmp_path)
+    bm.run_suite(path, [3], [4], [3], ['uniform'], 2, strategies = bm.CLASSIC, processes = 1)
+    kwargs = dict({'strategies': bm.CLASSIC, 'processes': 1}, **settings)
+    with pytest.raises(AssertionError):
+        bm.run_suite(path, [3], [4], [3], ['uniform'], 2, **kwargs)
+
+
+def test_measure_job_status_and_memory():
+    row = bm.measure_job((0, 'degree', 3, 5, 4, 'uniform', 0, {'time_limit': 0.0}))
+    assert row['status'] == 'time_limit' and row['num_pairs'] == 0 and row['peak_memory'] >= 0
+    row = bm.measure_job((0, 'degree', 3, 5, 4, 'uniform', 0))
+    assert row['status'] == 'complete' and row['wall_time'] > 0 and row['peak_memory'] > 0
+
+
+def test_parallel_benchmark_matches_serial_run():
+    done = []
+    serial = bm.parallel_benchmark(3, 4, 3, 4, 'uniform', processes = 1, seed = 2, progress = lambda k, total: done.append((k, total)))
+    assert bm.parallel_benchmark(3, 4, 3, 4, 'uniform', processes = 2, seed = 2) == serial
+    assert done == [(k, 12) for k in range(1, 13)]
+    # Every job regenerates its ideal from the seed, so a job run alone gives the same result
+    assert bm.run_job((3, 'first', 3, 4, 3, 'uniform', 2)) == (3, 'first', serial[1][3])
+
+
+def test_stream_benchmark_summarizes_the_jobs():
+    results = list(bm.iter_benchmark(3, 4, 3, 5, 'weighted', processes = 1, seed = 3))
+    done = []
+    stats = bm.stream_benchmark(3, 4, 3, 5, 'weighted', processes = 1, seed = 3, progress = lambda k, stats: done.append(k))
+    assert done == [1, 2, 3, 4, 5]
+    for strategy in bm.CLASSIC:
+        values = np.array([num_add for _, other, num_add in results if other == strategy])
+        assert stats[strategy].count == 5 and stats[strategy].min == values.min() and stats[strategy].max == values.max()
+        assert stats[strategy].mean == pytest.approx(values.mean()) and stats[strategy].std() == pytest.approx(values.std(ddof = 1))
+
+
+def test_running_stats_merge():
+    values = [3, 1, 4, 1, 5, 9, 2, 6]
+    whole, left, right = bm.RunningStats(), bm.RunningStats(), bm.RunningStats()
+    for k, x in enumerate(values):
+        whole.add(x)
+        (left if k < 3 else right).add(x)
+    left.merge(right)
+    left.merge(bm.RunningStats())
+    assert (left.count, left.min, left.max) == (whole.count, whole.min, whole.max)
+    assert left.mean == pytest.approx(whole.mean) and left.variance() == pytest.approx(whole.variance())
+
+
+def test_streamed_ideals_are_the_job_ideals():
+    # Ideal i of the stream is the one every job of ideal i regenerates, however far the stream is read
+    stream = list(itertools.islice(bm.iter_ideals(3, 4, 3, 'uniform', seed = 4), 6))
+    assert [i for i, _ in stream] == list(range(6))
+    for (i, ideal), (_, other) in zip(stream, bm.iter_ideals(3, 4, 3, 'uniform', seed = 4, N = 6)):
+        random.seed(bm.job_seed(4, i))
+        assert [f.keys for f in ideal] == [f.keys for f in other] == [f.keys for f in buch.random_ideal(3, 4, 3, 'uniform')]
@@ -0,0 +1,82 @@
+import buchberger as buch
+import basis as bs
+import reduction as rd
+import random
+import itertools
+import pytest
+
+
+def random_ideals(seed, count = 4):
+    """
+    Generate small random ideals reproducibly.
+    @param seed: The seed of the random module.
+    @param count: The number of ideals.
+    @return: List of ideals, each a list of polynomials.
+    """
+
+    random.seed(seed)
+    return [buch.random_ideal(random.choice([3, 4]), random.choice([4, 5]), random.choice([3, 4]), random.choice(['uniform', 'weighted']))
+            for _ in range(count)]
+
+
+def terms(G):
+    """
+    @param G: List of polynomials.
+    @return: The terms of the polynomials, comparable across runs.
+    """
+
+    return [(g.keys, g.coefs.tolist()) for g in G]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_criteria_keep_the_basis(seed):
+    for k, F in enumerate(random_ideals(seed)):
+        for algorithm in (buch.buchberger_random, buch.buchberger_first, buch.buchberger_degree):
+            random.seed(k)
+            pruned_stats = {}
+            G, _ = algorithm(F, True, pruned_stats)
+            random.seed(k)
+            full_stats = {}
+            H, _ = algorithm(F, False, full_stats)
+            assert terms(bs.reduced_basis(G)) == terms(bs.reduced_basis(H))
+            assert full_stats['num_pruned'] == 0 and pruned_stats['num_pruned'] > 0
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_criteria_only_skip_zero_reductions(seed):
+    for F in random_ideals(seed):
+        G, _ = buch.buchberger_degree(F)
+        reduced = bs.reduced_basis(G)
+        # Every pair of the final basis reduces to zero, including the pairs the criteria skipped
+        for i in range(len(G)):
+            for j in range(i + 1, len(G)):
+                s = rd.S(G[i], G[j])
+                assert rd.reduce_full(s, reduced)[0].is_zero()
+
+
+def test_bounded_run_reports_status():
+    F = random_ideals(6, 1)[0]
+    with pytest.raises(AssertionError):
+        buch.buchberger_degree(F, max_pairs = 1)
+    stats = {}
+    G, num_add = buch.buchberger_degree(F, stats = stats, max_pairs = 1)
+    assert stats['status'] == 'max_pairs' and stats['num_pairs'] == 1 and num_add <= 1
+
+
+@pytest.mark.parametrize('n, d', [(1, 3), (2, 1), (2, 2), (3, 3)])
+def test_all_monomials_up_to(n, d):
+    expected = sorted([e for e in itertools.product(range(d + 1), repeat = n) if 1 <= sum(e) <= d])
+    monomials = list(buch.all_monomials_up_to(n, d))
+    assert len(monomials) == len(expected) and sorted(monomials) == expected
+
+
+def test_shared_positional_parameters():
+    F = random_ideals(7, 1)[0]
+    # criteria, stats, reduced and listener come in the same positions for every classic strategy
+    bases = []
+    for algorithm in (buch.buchberger_random, buch.buchberger_first, buch.buchberger_degree):
+        events = []
+        G, _ = algorithm(F, True, {}, True, lambda name, data: events.append(name))
+        assert len(events) > 0
+        bases.append(terms(G))
+    assert bases[0] == bases[1] == bases[2]
@@ -0,0 +1,31 @@
+import polynomial as poly
+import divisor as dv
+import numpy as np
+import pickle
+import pytest
+
+
+@pytest.mark.parametrize('order', ['grevlex', 'lex'])
+def test_index_matches_linear_scan(order):
+    rng = np.random.default_rng(0)
+    nvar = 3
+    G = [poly.Polynomial([[1] + rng.integers(0, 4, nvar).tolist(), [1] + [0] * nvar], order = order) for _ in range(60)]
+    G = [g for g in G if not g.is_zero()]
+    index = dv.DivisorIndex(nvar, G[:40], order)
+    live = list(G[:40])
+    # G[0] is added twice and removed twice
+    for g in G[40:] + [G[0]]:
+        index.add(g)
+        live.append(g)
+    for g in G[::3] + [G[0]]:
+        index.remove(g)
+        # Remove the object itself, not an equal polynomial added earlier
+        live.pop([i for i, h in enumerate(live) if h is g][0])
+    # The map of positions is rebuilt after unpickling
+    index = pickle.loads(pickle.dumps(index))
+
+    packer = G[0].packer
+    assert len(index) == len(live)
+    for exps in rng.integers(0, 6, (200, nvar)):
+        key = packer.pack([exps])[0]
+        assert index.divisors(key) == [g for g in live if packer.divides(g.lm, key)]
@@ -0,0 +1,25 @@
+import buchberger as buch
+import basis as bs
+import f4
+import random
+import pytest
+from test_buchberger import random_ideals, terms
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_f4_matches_buchberger(seed):
+    for F in random_ideals(seed):
+        for criteria in (True, False):
+            stats = {}
+            G, _ = f4.buchberger_f4(F, criteria, stats)
+            H, _ = buch.buchberger_degree(F)
+            assert terms(bs.reduced_basis(G)) == terms(bs.reduced_basis(H))
+            assert stats['num_pairs'] > 0
+
+
+def test_f4_lex():
+    random.seed(0)
+    F = [f.with_order('lex') for f in buch.random_ideal(3, 4, 3, 'uniform')]
+    G, _ = f4.buchberger_f4(F)
+    H, _ = buch.buchberger_degree(F)
+    assert terms(bs.reduced_basis(G)) == terms(bs.reduced_basis(H))
@@ -0,0 +1,21 @@
+import numpy as np
+import finite_field as ff
+import pytest
+
+
+@pytest.mark.parametrize('p', [23, 65537, 2147483647])
+def test_inverse(p):
+    field = ff.get_field(p)
+    values = np.array([1, 2, p - 1, p + 3], dtype = np.int64)
+    assert (field.mul(field.inv(values), values) % p == 1).all()
+    assert all([field.mul(field.inv(int(x)), int(x)) % p == 1 for x in values])
+
+
+@pytest.mark.parametrize('p', [23, 65537])
+def test_zero_has_no_inverse(p):
+    field = ff.get_field(p)
+    for zero in (0, p, np.int64(0), np.array([1, 0])):
+        with pytest.raises(ZeroDivisionError):
+            field.inv(zero)
+    with pytest.raises(ZeroDivisionError):
+        field.div(3, 0)
@@ -0,0 +1,58 @@
+import buchberger as buch
+import instrument as it
+import polynomial as poly
+import random
+import pytest
+from test_buchberger import random_ideals
+
+
+@pytest.mark.parametrize('algorithm', [buch.buchberger_random, buch.buchberger_first, buch.buchberger_degree])
+def test_events_fire_in_documented_order(algorithm):
+    for k, F in enumerate(random_ideals(9)):
+        random.seed(k)
+        recorder = it.Recorder()
+        stats = {}
+        G, num_add = algorithm(F, True, stats, False, recorder)
+        names = [event for event, _ in recorder.events]
+        assert set(names) <= set(it.EVENTS)
+
+        # Pruning of the initial pairs may come first, then every step selects a pair, reduces it and either adds the remainder
+        # to the basis, possibly pruning pairs, or records a zero reduction
+        position = 1 if names[:1] == ['pairs_pruned'] else 0
+        steps = 0
+        while position < len(names):
+            assert names[position:position + 3] == ['pair_selected', 'reduction_started', 'reduction_finished']
+            pair = recorder.events[position][1]['pair']
+            assert all([data['pair'] == pair for _, data in recorder.events[position + 1:position + 3]])
+            position += 3
+            assert names[position] in ('zero_reduction', 'basis_grown')
+            if names[position] == 'basis_grown':
+                assert recorder.events[position][1]['size'] == recorder.events[position][1]['position'] + 1
+                if names[position + 1:position + 2] == ['pairs_pruned']:
+                    position += 1
+            position += 1
+            steps += 1
+
+        assert steps == stats['num_pairs'] and names.count('zero_reduction') == stats['num_zero']
+        assert sum([data['count'] for event, data in recorder.events if event == 'pairs_pruned']) == stats['num_pruned']
+        assert names.count('basis_grown') == len(G) - len(F)
+
+
+def test_profile_aggregates_events():
+    F = random_ideals(10, 1)[0]
+    recorder = it.Recorder()
+    random.seed(0)
+    buch.buchberger_degree(F, listener = recorder)
+
+    random.seed(0)
+    with it.Profile() as profile:
+        assert poly.construction_time is not None
+        buch.buchberger_degree(F, listener = profile)
+    # Leaving the context stops timing the construction of polynomials
+    assert poly.construction_time is None
+
+    assert profile.counts == dict([(event, [name for name, _ in recorder.events].count(event)) for event in it.EVENTS])
+    assert profile.num_add == sum([data['num_add'] for event, data in recorder.events if event == 'reduction_finished'])
+    assert profile.max_degree == max([0] + [data['degree'] for event, data in recorder.events if event == 'basis_grown'])
+    assert profile.num_polynomials > 0 and profile.times['Polynomial'] > 0
+    assert len(profile.report().splitlines()) == len(it.EVENTS) + 5 + len(profile.times)
@@ -0,0 +1,55 @@
+import multimodular as mm
+from fractions import Fraction
+import random
+import pytest
+
+
+# x1 = 1/2 and 3 x2^2 + x1 - 5 = 0, whose reduced basis is x1 - 1/2, x2^2 - 3/2
+F = [[[2, 1, 0], [-1, 0, 0]], [[3, 0, 2], [1, 1, 0], [-5, 0, 0]]]
+BASIS = [[(Fraction(1), (1, 0)), (Fraction(-1, 2), (0, 0))], [(Fraction(1), (0, 2)), (Fraction(-3, 2), (0, 0))]]
+
+
+def test_crt():
+    random.seed(0)
+    m, p = 2 ** 31 - 1, 2 ** 31 - 19
+    for _ in range(100):
+        a, b = random.randrange(m), random.randrange(p)
+        x = mm.crt(a, m, b, p)
+        assert 0 <= x < m * p and x % m == a and x % p == b
+
+
+def test_rational_reconstruction():
+    m = (2 ** 31 - 1) * (2 ** 31 - 19)
+    for r, s in [(0, 1), (1, 1), (-1, 2), (7, 13), (-123456, 789)]:
+        a = r * pow(s, -1, m) % m
+        assert mm.rational_reconstruction(a, m) == Fraction(r, s)
+
+
+def test_prime_dividing_a_leading_coefficient_is_rejected():
+    p, G = mm.modular_basis((101, [[[101, 1, 0], [1, 0, 1]]], None))
+    assert G is None
+    p, G = mm.modular_basis((103, [[[101, 1, 0], [1, 0, 1]]], None))
+    assert G is not None
+
+
+def test_rational_basis():
+    assert mm.rational_basis(F, processes = 1) == BASIS
+
+
+def test_majority_vote_drops_unlucky_primes(monkeypatch):
+    unlucky = mm.primes_below(mm.PRIME_MAX + 1, 2)[1]
+    modular_basis = mm.modular_basis
+
+    def with_unlucky_prime(job):
+        # The basis of another ideal stands for a prime with other leading monomials
+        if job[0] == unlucky:
+            return modular_basis((unlucky, [[[1, 0, 1]], [[1, 1, 0]]], job[2]))
+        return modular_basis(job)
+
+    monkeypatch.setattr(mm, 'modular_basis', with_unlucky_prime)
+    assert mm.rational_basis(F, batch = 3, processes = 1) == BASIS
+
+
+def test_unstable_reconstruction_raises():
+    with pytest.raises(RuntimeError):
+        mm.rational_basis(F, batch = 1, max_primes = 1, processes = 1)
@@ -0,0 +1,26 @@
+import buchberger as buch
+import reduction as rd
+import normal_form as nf
+import random
+import pytest
+
+
+@pytest.mark.parametrize('order', ['grevlex', 'lex'])
+def test_reduce_and_contains_match_reduce_full(order):
+    random.seed(3)
+    F = [f.with_order(order) for f in buch.random_ideal(3, 6, 3, 'weighted')]
+    G, _ = buch.buchberger_degree(F)
+    service = nf.NormalForm(G, cache_size = 16)
+    Q = [buch.random_ideal(3, 5, 4, 'uniform')[0].with_order(order) for _ in range(40)]
+    # Multiples of the generators are in the ideal
+    Q += [q.multiply(F[0]).add(q.multiply(F[-1])) for q in Q[:10]]
+
+    expected = [rd.reduce_full(q, G)[0] for q in Q]
+    for q, r in zip(Q, expected):
+        assert service.reduce(q) == r
+        # The cache never holds more normal forms than its bound
+        assert len(service.cache) <= 16
+    assert [service.contains(q) for q in Q] == [r.is_zero() for r in expected]
+    assert all([service.contains(q) for q in Q[40:]])
+    # Evicted monomials are reduced again when needed
+    assert len(service.cache) == 16 and service.hits > 0 and service.misses > 16
@@ -0,0 +1,39 @@
+import pairs as pq
+import random
+import pytest
+from test_buchberger import random_ideals
+
+
+@pytest.mark.parametrize('key', ['normal', 'sugar', 'first'])
+def test_pair_queue_pops_in_key_order(key):
+    for G in random_ideals(8):
+        sugar = dict([(f, f.sugar + k) for k, f in enumerate(G)])
+        all_pairs = [(i, j) for j in range(len(G)) for i in range(j)]
+        queue = pq.PairQueue(G, key, sugar)
+        # Pushing a pair twice keeps its first insertion
+        queue.extend(all_pairs + all_pairs[:2])
+        removed = all_pairs[1::3]
+        for pair in removed:
+            queue.remove(pair)
+
+        def priority(pair):
+            f, g = G[pair[0]], G[pair[1]]
+            lcm_degree = f.packer.degree(f.packer.lcm(f.lm, g.lm))
+            return pq.KEYS[key](f, g, lcm_degree, sugar), all_pairs.index(pair)
+
+        expected = sorted([pair for pair in all_pairs if pair not in removed], key = priority)
+        assert len(queue) == len(expected)
+        assert queue.peek_priority() == priority(expected[0])[0]
+        assert [queue.pop() for _ in range(len(expected))] == expected
+        assert len(queue) == 0 and queue.peek_priority() is None
+
+
+def test_random_pair_queue_pops_each_pair_once():
+    random.seed(0)
+    queue = pq.RandomPairQueue()
+    all_pairs = [(i, j) for j in range(8) for i in range(j)]
+    queue.extend(all_pairs + all_pairs[:3])
+    for pair in all_pairs[::4]:
+        queue.remove(pair)
+    popped = [queue.pop() for _ in range(len(queue))]
+    assert sorted(popped) == sorted(set(all_pairs) - set(all_pairs[::4])) and len(queue) == 0
@@ -0,0 +1,103 @@
+import numpy as np
+import polynomial as poly
+import finite_field as ff
+import order as od
+import divisor as dv
+import pickle
+import pytest
+
+
+def reference_terms(rows, p):
+    """
+    Normalize terms the way the original constructor did: mergesort in grevlex order, group equal monomials and drop zeros.
+    @param rows: 2-D integer array of terms, the coefficient followed by the exponents.
+    @param p: The characteristic of the field.
+    @return: List of (coefficient, exponents) tuples in descending order.
+    """
+
+    arr = rows.astype(float)
+    poly.mergesort(arr)
+    terms = []
+    for row in arr[::-1]:
+        coef, exps = int(row[0]), tuple([int(e) for e in row[1:]])
+        if len(terms) > 0 and terms[-1][1] == exps:
+            terms[-1] = ((terms[-1][0] + coef) % p, exps)
+        else:
+            terms.append((coef % p, exps))
+    return [(coef, exps) for coef, exps in terms if coef != 0]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_lexsort_matches_mergesort(seed):
+    rng = np.random.default_rng(seed)
+    nvar = int(rng.integers(1, 6))
+    nterm = int(rng.integers(1, 40))
+    # Few distinct exponents, so that equal monomials and cancellations are frequent
+    rows = np.column_stack([rng.integers(-50, 50, nterm), rng.integers(0, 3, (nterm, nvar))])
+    p = ff.default_field().p
+
+    f = poly.Polynomial(rows)
+    terms = [(int(coef), tuple(exps.tolist())) for coef, exps in zip(f.coefs, f.exps)]
+    assert terms == reference_terms(rows, p)
+
+
+def test_compare_is_grevlex():
+    assert poly.compare(np.array([1, 2, 0]), np.array([1, 0, 1])) == 1
+    assert poly.compare(np.array([1, 1, 1]), np.array([1, 2, 0])) == -1
+    assert poly.compare(np.array([5, 1, 1]), np.array([3, 1, 1])) == 0
+
+
+def test_degree_is_largest_term_degree():
+    # Under lex the leading term x1 has degree 1, below the degree of x2^3
+    f = poly.Polynomial([[1, 1, 0], [1, 0, 3]], order = 'lex')
+    g = poly.Polynomial.from_packed(f.coefs, f.keys, f.nvar, order = 'lex')
+    h = poly.Polynomial.from_sorted(f.coefs.copy(), f.exps.copy(), order = 'lex')
+    assert f.degree == g.degree == h.degree == f.sugar == 3
+
+
+@pytest.mark.parametrize('order', ['grevlex', 'lex', od.WeightedDegree([1, 2, 3]), od.Block([1, 2])])
+def test_heap_product_matches_outer_product(order, monkeypatch):
+    rng = np.random.default_rng(0)
+    pairs = [[poly.Polynomial(np.column_stack([rng.integers(1, 100, n), rng.integers(0, 4, (n, 3))]), order = order)
+              for n in rng.integers(2, 30, 2)] for _ in range(10)]
+    outer = [f.multiply(g) for f, g in pairs]
+    # Every product of two polynomials with several terms now goes through multiply_terms
+    monkeypatch.setattr(poly, 'PRODUCT_MAX', 0)
+    for (f, g), h in zip(pairs, outer):
+        product = f.multiply(g)
+        assert product.keys == h.keys and product.coefs.tolist() == h.coefs.tolist()
+
+
+def test_exponent_overflow_raises():
+    packer = poly.Polynomial([[1, 1, 0]]).packer
+    top = packer.exponent_max
+    with pytest.raises(OverflowError):
+        poly.Polynomial([[1, top + 1, 0]])
+    f = poly.Polynomial([[1, top, 0], [1, 0, 1]])
+    g = poly.Polynomial([[1, 1, 0], [1, 0, 2]])
+    with pytest.raises(OverflowError):
+        f.multiply(g)
+
+
+def test_monomial_order_is_abstract():
+    with pytest.raises(TypeError):
+        od.MonomialOrder()
+
+
+@pytest.mark.parametrize('order', ['grevlex', 'lex', od.WeightedDegree([2, 1, 1])])
+def test_cached_leading_term(order):
+    rng = np.random.default_rng(1)
+    for _ in range(10):
+        rows = np.column_stack([rng.integers(1, 100, 6), rng.integers(0, 5, (6, 3))])
+        f = poly.Polynomial(rows, order = order)
+        exps = f.exps.copy()
+        # The same terms built from packed monomials, from sorted arrays, and restored from a pickle
+        for g in (f, poly.Polynomial.from_packed(f.coefs, f.keys, 3, order = order),
+                  poly.Polynomial.from_sorted(f.coefs.copy(), exps, order = order), pickle.loads(pickle.dumps(f))):
+            for _ in range(2):
+                assert g.lm == f.packer.pack(exps[:1])[0] and g.lc == int(f.coefs[0])
+                assert g.divmask == dv.divmask(exps[0].tolist()) and g.sugar == int(exps.sum(axis = 1).max())
+            assert g.lt().keys == (g.lm, ) and g.lt() is g.lt()
+
+    zero = poly.Polynomial([[0, 1, 2, 3]], order = order)
+    assert (zero.lm, zero.lc, zero.divmask, zero.sugar) == (None, 0, 0, 0)
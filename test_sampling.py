@@ -0,0 +1,31 @@
+import buchberger as buch
+import sampling as sp
+import random
+import pytest
+
+
+@pytest.mark.parametrize('n, d', [(1, 4), (2, 3), (3, 4), (4, 2)])
+def test_unranking_matches_enumeration(n, d):
+    monomials = list(buch.all_monomials(n, d))
+    assert sp.num_monomials(n, d) == len(monomials)
+    assert [sp.unrank_monomial(n, d, rank) for rank in range(len(monomials))] == monomials
+
+    monomials = list(buch.all_monomials_up_to(n, d))
+    assert sp.num_monomials_up_to(n, d) == len(monomials)
+    assert [sp.unrank_monomial_up_to(n, d, rank) for rank in range(len(monomials))] == monomials
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_samples_match_sampling_the_enumeration(seed):
+    n, d, k = 3, 4, 5
+    for sample, enumerate_and_sample in [(lambda: sp.sample_monomials(n, d, k), lambda: random.sample(list(buch.all_monomials(n, d)), k)),
+                                         (lambda: sp.sample_monomials_up_to(n, d, k),
+                                          lambda: random.sample(list(buch.all_monomials_up_to(n, d)), k)),
+                                         (lambda: sp.choice_monomial(n, d), lambda: random.choice(list(buch.all_monomials(n, d))))]:
+        random.seed(seed)
+        expected = enumerate_and_sample()
+        after = random.random()
+        random.seed(seed)
+        assert sample() == expected
+        # Both draw the same random numbers, so the rest of the run is unchanged
+        assert random.random() == after
@@ -0,0 +1,23 @@
+import buchberger as buch
+import basis as bs
+import signature as sg
+import pytest
+from test_buchberger import random_ideals, terms
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_signature_matches_buchberger(seed):
+    for F in random_ideals(seed):
+        stats = {}
+        G, _ = sg.buchberger_signature(F, stats)
+        H, _ = buch.buchberger_degree(F)
+        assert terms(bs.reduced_basis(G)) == terms(bs.reduced_basis(H))
+        assert stats['num_pairs'] >= len(F)
+
+
+def test_signature_skips_duplicates_and_zeros():
+    F = random_ideals(0, 1)[0]
+    zero = F[0].subtract(F[0])
+    G, _ = sg.buchberger_signature(F + [F[0], zero])
+    H, _ = sg.buchberger_signature(F)
+    assert terms(G) == terms(H)
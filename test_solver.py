@@ -0,0 +1,78 @@
+import buchberger as buch
+import basis as bs
+import solver as sv
+import random
+import pytest
+from test_buchberger import random_ideals, terms
+
+
+@pytest.mark.parametrize('selection', ['random', 'first', 'normal', 'sugar'])
+def test_checkpoint_and_resume(selection, tmp_path):
+    path = str(tmp_path / 'solver.pkl')
+    for k, F in enumerate(random_ideals(1)):
+        random.seed(k)
+        G, _ = sv.Solver(F, selection).run()
+
+        random.seed(k)
+        solver = sv.Solver(F, selection)
+        for _ in range(2):
+            if not solver.done():
+                solver.step()
+        solver.save(path)
+        if not solver.done():
+            solver.step()
+        # The checkpoint holds the state at the time of the save, whatever happened after it
+        resumed = sv.Solver.load(path)
+        H, _ = resumed.run()
+        assert resumed.done()
+        assert terms(bs.reduced_basis(G)) == terms(bs.reduced_basis(H))
+
+
+def test_deterministic_resume_matches_uninterrupted_run(tmp_path):
+    path = str(tmp_path / 'solver.pkl')
+    F = random_ideals(2, 1)[0]
+    # Reduction draws from the random module, which the checkpoint does not hold, so both runs start from the same state
+    random.seed(0)
+    G, num_add = sv.Solver(F, 'normal').run()
+    random.seed(0)
+    solver = sv.Solver(F, 'normal')
+    solver.step()
+    solver.save(path)
+    H, resumed_add = sv.Solver.load(path).run()
+    assert terms(G) == terms(H) and num_add == resumed_add
+
+
+def test_add_generators():
+    F = random_ideals(3, 1)[0]
+    solver = sv.Solver(F[:2], 'normal', reduced = True)
+    solver.run()
+    solver.add_generators(F[2:] + [F[0]])
+    G, _ = solver.run()
+    H, _ = buch.buchberger_degree(F, reduced = True)
+    assert terms(G) == terms(H)
+
+
+def test_reduced_resume_after_checkpoint(tmp_path):
+    path = str(tmp_path / 'solver.pkl')
+    for F in random_ideals(4):
+        solver = sv.Solver(F, 'normal', reduced = True)
+        solver.step()
+        solver.save(path)
+        # Dropping redundant elements after the load removes them from the restored divisor index
+        G, _ = sv.Solver.load(path).run()
+        H, _ = buch.buchberger_degree(F, reduced = True)
+        assert terms(G) == terms(H)
+
+
+@pytest.mark.parametrize('selection', ['random', 'first', 'normal', 'sugar'])
+def test_binomial_path_matches_general_path(selection):
+    for k, F in enumerate(random_ideals(5, 8)):
+        results = []
+        for binomial in (True, False):
+            random.seed(k)
+            solver = sv.Solver(F, selection)
+            assert solver.binomial
+            solver.binomial = binomial
+            G, num_add = solver.run()
+            results.append((terms(G), num_add))
+        assert results[0] == results[1]
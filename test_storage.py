@@ -0,0 +1,18 @@
+import buchberger as buch
+import storage as st
+import numpy as np
+import random
+from test_buchberger import terms
+
+
+def test_store_round_trip(tmp_path):
+    random.seed(5)
+    ideals = [buch.random_ideal(3, 4, 4, 'uniform') for _ in range(3)]
+    store = st.IdealStore.from_ideals(ideals)
+    assert store.exps.dtype == np.uint16
+    store.save(str(tmp_path / 'store'))
+    loaded = st.IdealStore.load(str(tmp_path / 'store'))
+    for F, G in zip(ideals, loaded):
+        assert terms(F) == terms(G)
+        # The narrow exponents are widened on access, so arithmetic on them cannot wrap around
+        assert all([g.exps.dtype == np.int64 and (g.exps == f.exps).all() for f, g in zip(F, G)])